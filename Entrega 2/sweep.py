@@ -0,0 +1,231 @@
+# ==============================================================
+# BARRIDO DE HIPERPARÁMETROS EN PARALELO
+# Comparte los datos entre los scripts de entrenamiento: se preprocesan una
+# sola vez y quedan en una caché .npy (data/cache) que cada proceso del pool
+# abre con mmap (sin copias por tarea). Cada combinación se entrena en un
+# proceso y se registra en un file store local de MLflow.
+# ==============================================================
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+
+DATA_FILE = "data/USAHousingDataset.csv"
+CACHE_DIR = "data/cache"
+TRACKING_URI = "file:./mlruns"
+ARRAYS = ("X_train", "X_test", "y_train", "y_test")
+
+# Todo lo que define los arreglos de entrenamiento. Cambiar algo aquí (o el CSV)
+# cambia la clave de la caché y obliga a reconstruirla.
+PREPROCESAMIENTO = {
+    "drop": ["date", "street", "statezip", "country"],
+    "dummies": ["city"],
+    "target": "price",
+    "log_target": True,
+    "test_size": 0.3,
+    "random_state": 0,
+}
+
+# ==============================================================
+# 1. CARGA Y PREPROCESAMIENTO DE DATOS (CON CACHÉ)
+# ==============================================================
+def clave_cache(data_file=DATA_FILE, preprocesamiento=PREPROCESAMIENTO):
+    """Hash del contenido del CSV y de la configuración de preprocesamiento."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(data_file, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            digest.update(bloque)
+    digest.update(json.dumps(preprocesamiento, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def preprocesar(data_file=DATA_FILE, preprocesamiento=PREPROCESAMIENTO):
+    """Limpieza, dummies, log del precio y división, como arreglos float64."""
+    df = pd.read_csv(data_file)
+
+    # Limpieza básica
+    df = df.drop(columns=preprocesamiento["drop"])
+    df = df[df[preprocesamiento["target"]] > 0]
+    df = pd.get_dummies(df, columns=preprocesamiento["dummies"])
+
+    # Variables predictoras y objetivo (precio en log)
+    X = df.drop(columns=[preprocesamiento["target"]])
+    y = df[preprocesamiento["target"]].to_numpy(dtype=np.float64)
+    if preprocesamiento["log_target"]:
+        y = np.log(y)
+
+    # División de datos
+    divididos = train_test_split(
+        X.to_numpy(dtype=np.float64),
+        y,
+        test_size=preprocesamiento["test_size"],
+        random_state=preprocesamiento["random_state"],
+    )
+    return dict(zip(ARRAYS, divididos)), list(X.columns)
+
+
+def datos_en_cache(data_file=DATA_FILE, cache_dir=CACHE_DIR):
+    """
+    Directorio con los arreglos preprocesados en .npy. Se construye solo si
+    no existe una entrada para este CSV y esta configuración.
+    """
+    directorio = os.path.join(cache_dir, clave_cache(data_file))
+    if os.path.isdir(directorio):
+        return directorio
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temporal = tempfile.mkdtemp(dir=cache_dir, prefix=".construyendo-")
+    arreglos, columnas = preprocesar(data_file)
+    for nombre, arreglo in arreglos.items():
+        np.save(os.path.join(temporal, f"{nombre}.npy"), arreglo)
+    with open(os.path.join(temporal, "columnas.json"), "w") as archivo:
+        json.dump(columnas, archivo)
+
+    try:
+        os.replace(temporal, directorio)
+    except OSError:
+        # otro proceso la construyó primero
+        shutil.rmtree(temporal, ignore_errors=True)
+    return directorio
+
+
+def cargar_datos(data_file=DATA_FILE, cache_dir=CACHE_DIR, mmap_mode=None):
+    """Arreglos X_train, X_test, y_train, y_test desde la caché."""
+    directorio = datos_en_cache(data_file, cache_dir)
+    return {
+        nombre: np.load(os.path.join(directorio, f"{nombre}.npy"), mmap_mode=mmap_mode)
+        for nombre in ARRAYS
+    }
+
+
+def combinaciones(param_grid):
+    """Todas las combinaciones de la grilla, como diccionarios de parámetros."""
+    nombres = list(param_grid)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*param_grid.values())]
+
+
+# ==============================================================
+# 2. ENTRENAMIENTO EN LOS PROCESOS DEL POOL
+# ==============================================================
+_datos = {}
+
+
+def _iniciar_worker(directorio, tracking_uri, experiment_id):
+    """Abre los arreglos compartidos y la conexión a MLflow, una vez por proceso."""
+    import mlflow
+
+    for nombre in ARRAYS:
+        _datos[nombre] = np.load(os.path.join(directorio, f"{nombre}.npy"), mmap_mode="r")
+    mlflow.set_tracking_uri(tracking_uri)
+    _datos["experiment_id"] = experiment_id
+
+
+def _entrenar(nombre, estimador, params, log_model):
+    """Entrena una combinación, calcula las métricas y registra el run."""
+    import mlflow
+    import mlflow.sklearn
+
+    inicio = time.perf_counter()
+    modelo = estimador(**params)
+    modelo.fit(_datos["X_train"], _datos["y_train"])
+    y_pred = modelo.predict(_datos["X_test"])
+
+    # Métricas de evaluación
+    mse = mean_squared_error(_datos["y_test"], y_pred)
+    metricas = {
+        "MAE": mean_absolute_error(_datos["y_test"], y_pred),
+        "MSE": mse,
+        "RMSE": np.sqrt(mse),
+        "R2": r2_score(_datos["y_test"], y_pred),
+    }
+
+    # Registro en MLflow
+    with mlflow.start_run(run_name=nombre, experiment_id=_datos["experiment_id"]):
+        mlflow.log_param("Modelo", nombre)
+        mlflow.log_params(params)
+        mlflow.log_metrics(metricas)
+        if log_model:
+            # Evitar errores por caracteres inválidos
+            safe_name = nombre.replace(".", "_").replace(":", "_").replace("/", "_")
+            mlflow.sklearn.log_model(modelo, name=safe_name)
+
+    return {"nombre": nombre, "segundos": time.perf_counter() - inicio, **metricas}
+
+
+# ==============================================================
+# 3. BARRIDO COMPLETO
+# ==============================================================
+def ejecutar_barrido(
+    *,
+    experimento,
+    estimador,
+    param_grid,
+    nombre_run,
+    params_fijos=None,
+    workers=None,
+    tracking_uri=TRACKING_URI,
+    data_file=DATA_FILE,
+    log_model=True,
+):
+    """
+    Entrena `estimador` con cada combinación de `param_grid` (más los
+    `params_fijos`) en `workers` procesos. `nombre_run` construye el nombre
+    del run a partir de los parámetros. Devuelve las métricas ordenadas por RMSE.
+    """
+    import mlflow
+
+    inicio = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    mlflow.set_tracking_uri(tracking_uri)
+    experiment_id = mlflow.set_experiment(experimento).experiment_id
+
+    tareas = [
+        (nombre_run(params), {**params, **(params_fijos or {})})
+        for params in combinaciones(param_grid)
+    ]
+
+    resultados = []
+    directorio = datos_en_cache(data_file)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_iniciar_worker,
+        initargs=(directorio, tracking_uri, experiment_id),
+    ) as executor:
+        futuros = [
+            executor.submit(_entrenar, nombre, estimador, params, log_model)
+            for nombre, params in tareas
+        ]
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            print(
+                f"{resultado['nombre']} → RMSE: {resultado['RMSE']:.3f} "
+                f"| R²: {resultado['R2']:.3f} ({resultado['segundos']:.1f} s)"
+            )
+
+    resultados.sort(key=lambda resultado: resultado["RMSE"])
+    print(
+        f"\n {len(resultados)} modelos registrados en {tracking_uri} "
+        f"({experimento}) en {time.perf_counter() - inicio:.1f} s con {workers} procesos."
+    )
+    print(f" Mejor: {resultados[0]['nombre']} → RMSE: {resultados[0]['RMSE']:.3f}")
+    return resultados
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--tracking-uri", default=TRACKING_URI, help="MLflow, p. ej. file:./mlruns o http://host:5000")
+    parser.add_argument("--no-log-model", action="store_true", help="registra solo parámetros y métricas")
+    return parser.parse_args()
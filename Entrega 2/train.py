@@ -5,13 +5,13 @@
 
 import mlflow
 import mlflow.sklearn
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, KFold
+from sklearn.model_selection import KFold
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from xgboost import XGBRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sweep import cargar_datos
 
 # ==============================================================
 # 1. CONEXIÓN A MLFLOW REMOTO (EC2)
@@ -22,19 +22,11 @@ mlflow.set_experiment("USA-House-Prices")
 # ==============================================================
 # 2. CARGA Y PREPROCESAMIENTO DE DATOS
 # ==============================================================
-df = pd.read_csv("data/USAHousingDataset.csv")
-
-# Limpieza básica
-df = df.drop(columns=['date', 'street', 'statezip', 'country'])
-df = df[df['price'] > 0]
-df = pd.get_dummies(df, columns=['city'])
-
-# Variables predictoras y objetivo (precio en log)
-X = df.drop(columns=['price'])
-y = np.log(df['price'])
-
-# División de datos
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=0)
+# Limpieza, dummies de ciudad, precio en log y división 70/30, leídos de la
+# caché data/cache (se reconstruye solo si cambia el CSV, ver sweep.py)
+datos = cargar_datos()
+X_train, X_test = datos["X_train"], datos["X_test"]
+y_train, y_test = datos["y_train"], datos["y_test"]
 cv = KFold(n_splits=5, shuffle=True, random_state=0)
 
 # ==============================================================
@@ -2,81 +2,38 @@
 # ENTRENAMIENTO DE MODELOS - PROYECTO DESPLIEGUE DE SOLUCIONES ANALÍTICAS
 # Predicción del precio de viviendas en EE. UU.
 # ==============================================================
+# Uso: python train_lr.py --workers 8
+# Los datos se cargan una vez y la grilla se entrena en paralelo (ver sweep.py).
+# Los runs quedan en ./mlruns; use --tracking-uri http://3.214.199.14:5000 para el MLflow remoto (EC2).
 
-import mlflow
-import mlflow.sklearn
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.linear_model import Ridge
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-import itertools
+from sweep import ejecutar_barrido, parse_args
 
 # ==============================================================
-# 1. CONEXIÓN A MLFLOW REMOTO (EC2)
-# ==============================================================
-mlflow.set_tracking_uri("http://3.214.199.14:5000")
-mlflow.set_experiment("Linear Regression - Ridge")
-
-# ==============================================================
-# 2. CARGA Y PREPROCESAMIENTO DE DATOS
-# ==============================================================
-df = pd.read_csv("data/USAHousingDataset.csv")
-
-# Limpieza básica
-df = df.drop(columns=['date', 'street', 'statezip', 'country'])
-df = df[df['price'] > 0]
-df = pd.get_dummies(df, columns=['city'])
-
-# Variables predictoras y objetivo (precio en log)
-X = df.drop(columns=['price'])
-y = np.log(df['price'])
-
-# División de datos
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=0)
-
-# ==============================================================
-# 3. PARAMETROS
+# 1. HIPERPARÁMETROS
 # ==============================================================
 param_grid = {
     "alpha": [0.1, 1.0, 10.0],
-    "solver": ["svd", "cholesky","lsqr"]
+    "solver": ["svd", "cholesky", "lsqr"]
 }
 
-param_combinations = list(itertools.product(
-    param_grid["alpha"],
-    param_grid["solver"]
-))
+
+def nombre_run(p):
+    return f"Ridge_alpha_{p['alpha']}_solver_{p['solver']}".replace(".", "_")
 
 
 # ==============================================================
-# 4. LOOP DE ENTRENAMIENTO Y REGISTRO EN MLFLOW
+# 2. BARRIDO EN PARALELO Y REGISTRO EN MLFLOW
 # ==============================================================
-for alpha, solver in param_combinations:
-
-    nombre = f"Ridge_alpha_{alpha}_solver_{solver}"
-    nombre = nombre.replace(".", "_")
-    
-    with mlflow.start_run(run_name=nombre):
-        #Entrenamiento del modelo
-        modelo=Ridge(alpha=alpha, solver=solver)
-        modelo.fit(X_train, y_train)
-        y_pred=modelo.predict(X_test)
-
-        # Métricas de evaluación
-        mae = mean_absolute_error(y_test, y_pred)
-        mse = mean_squared_error(y_test, y_pred)
-        rmse = np.sqrt(mse)
-        r2 = r2_score(y_test, y_pred)
-
-        # Registro en MLflow
-        mlflow.log_param("Modelo", nombre)
-        mlflow.log_metric("MAE", mae)
-        mlflow.log_metric("MSE", mse)
-        mlflow.log_metric("RMSE", rmse)
-        mlflow.log_metric("R2", r2)
-        mlflow.sklearn.log_model(modelo, name=nombre)
-
-        print(f"{nombre} → RMSE: {rmse:.3f} | R²: {r2:.3f}")
-
-print("\n Todos los modelos fueron registrados correctamente en MLflow remoto (EC2).")
+if __name__ == "__main__":
+    args = parse_args()
+    ejecutar_barrido(
+        experimento="Linear Regression - Ridge",
+        estimador=Ridge,
+        param_grid=param_grid,
+        params_fijos=None,
+        nombre_run=nombre_run,
+        workers=args.workers,
+        tracking_uri=args.tracking_uri,
+        log_model=not args.no_log_model,
+    )
@@ -2,82 +2,39 @@
 # ENTRENAMIENTO DE MODELOS - PROYECTO DESPLIEGUE DE SOLUCIONES ANALÍTICAS
 # Predicción del precio de viviendas en EE. UU.
 # ==============================================================
+# Uso: python train_rf.py --workers 8
+# Los datos se cargan una vez y la grilla se entrena en paralelo (ver sweep.py).
+# Los runs quedan en ./mlruns; use --tracking-uri http://3.214.199.14:5000 para el MLflow remoto (EC2).
 
-import mlflow
-import mlflow.sklearn
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-import itertools
+from sweep import ejecutar_barrido, parse_args
 
 # ==============================================================
-# 1. CONEXIÓN A MLFLOW REMOTO (EC2)
-# ==============================================================
-mlflow.set_tracking_uri("http://3.214.199.14:5000")
-mlflow.set_experiment("Random forest regressor")
-
-# ==============================================================
-# 2. CARGA Y PREPROCESAMIENTO DE DATOS
-# ==============================================================
-df = pd.read_csv("data/USAHousingDataset.csv")
-
-# Limpieza básica
-df = df.drop(columns=['date', 'street', 'statezip', 'country'])
-df = df[df['price'] > 0]
-df = pd.get_dummies(df, columns=['city'])
-
-# Variables predictoras y objetivo (precio en log)
-X = df.drop(columns=['price'])
-y = np.log(df['price'])
-
-# División de datos
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=0)
-
-# ==============================================================
-# 3. PARAMETROS
+# 1. HIPERPARÁMETROS
 # ==============================================================
 param_grid = {
-    "n_est": [50, 100, 200],
-    "max_d": [3, 5, None],
-    "min_split": [2, 5]
+    "n_estimators": [50, 100, 200],
+    "max_depth": [3, 5, None],
+    "min_samples_split": [2, 5]
 }
 
-param_combinations = list(itertools.product(
-    param_grid["n_est"],
-    param_grid["max_d"],
-    param_grid["min_split"]
-))
+
+def nombre_run(p):
+    return f"RF_n{p['n_estimators']}_d{p['max_depth']}_split{p['min_samples_split']}"
 
 
 # ==============================================================
-# 4. LOOP DE ENTRENAMIENTO Y REGISTRO EN MLFLOW
+# 2. BARRIDO EN PARALELO Y REGISTRO EN MLFLOW
 # ==============================================================
-for n_est, max_d, min_split in param_combinations:
-
-    nombre = f"RF_n{n_est}_d{max_d}_split{min_split}"
-    
-    with mlflow.start_run(run_name=nombre):
-        #Entrenamiento del modelo
-        modelo=RandomForestRegressor(n_estimators=n_est,max_depth=max_d,min_samples_split=min_split,random_state=42)
-        modelo.fit(X_train, y_train)
-        y_pred=modelo.predict(X_test)
-
-        # Métricas de evaluación
-        mae = mean_absolute_error(y_test, y_pred)
-        mse = mean_squared_error(y_test, y_pred)
-        rmse = np.sqrt(mse)
-        r2 = r2_score(y_test, y_pred)
-
-        # Registro en MLflow
-        mlflow.log_param("Modelo", nombre)
-        mlflow.log_metric("MAE", mae)
-        mlflow.log_metric("MSE", mse)
-        mlflow.log_metric("RMSE", rmse)
-        mlflow.log_metric("R2", r2)
-        mlflow.sklearn.log_model(modelo, name=nombre)
-
-        print(f"{nombre} → RMSE: {rmse:.3f} | R²: {r2:.3f}")
-
-print("\n Todos los modelos fueron registrados correctamente en MLflow remoto (EC2).")
+if __name__ == "__main__":
+    args = parse_args()
+    ejecutar_barrido(
+        experimento="Random forest regressor",
+        estimador=RandomForestRegressor,
+        param_grid=param_grid,
+        params_fijos={"random_state": 42, "n_jobs": 1},
+        nombre_run=nombre_run,
+        workers=args.workers,
+        tracking_uri=args.tracking_uri,
+        log_model=not args.no_log_model,
+    )
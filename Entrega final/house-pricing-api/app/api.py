@@ -1,16 +1,39 @@
 import json
-from typing import Any
+from typing import Any, Callable, Sequence
 
 import numpy as np
 import pandas as pd
-from fastapi import APIRouter, HTTPException
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from loguru import logger
-from model import __version__ as model_version
-from model.predict import make_prediction
+from model import metrics
+from model.predict import active_version
+from model.processing.data_manager import list_versions
 
 from app import __version__, schemas
+from app.batching import get_batcher
 from app.config import settings
+from app.metrics import observe_since_start, request_started
+from app.request_log import log_payload, log_summary, sample_payload, truncate
+from app.scoring import activate_version, run_prediction
+from app.serialization import (
+    ARROW_STREAM,
+    PARQUET,
+    FastJSONResponse,
+    binary_format,
+    columns_frame,
+    loads,
+    read_table,
+    write_predictions,
+)
+from app.stats import stats_payload
+from app.streaming import (
+    NDJSON,
+    STREAM_FORMATS,
+    body_format,
+    spool_body,
+    stream_predictions,
+)
 
 api_router = APIRouter()
 
@@ -21,27 +44,203 @@ def health() -> dict:
     Root Get
     """
     health = schemas.Health(
-        name=settings.PROJECT_NAME, api_version=__version__, model_version=model_version
+        name=settings.PROJECT_NAME,
+        api_version=__version__,
+        model_version=active_version(),
     )
 
     return health.dict()
 
+async def score(
+    input_df: pd.DataFrame,
+    *,
+    route: str,
+    started: float,
+    inputs: Callable[[], Sequence[Any]],
+) -> dict:
+    """
+    Score a request frame, input errors become a 400 response. `inputs`
+    gives the request payload, only called for the sampled requests.
+    """
+    sampled = sample_payload()
+    if sampled:
+        log_payload("Prediction inputs", inputs)
+
+    with metrics.timed("request_score"):
+        if settings.BATCHING_ENABLED:
+            results = await get_batcher().submit(input_df)
+        else:
+            results = await run_prediction(input_data=input_df)
+
+    summary = {
+        "route": route,
+        "rows": len(input_df),
+        "version": results["version"],
+        "started": started,
+    }
+    if results["errors"] is not None:
+        errors = json.loads(results["errors"])
+        log_summary(**summary, predictions=0, errors=len(errors))
+        logger.opt(lazy=True).warning(
+            "Prediction validation error: {}", lambda: truncate(errors)
+        )
+        raise HTTPException(status_code=400, detail=errors)
+
+    if sampled:
+        log_payload("Prediction results", lambda: results["predictions"])
+    log_summary(**summary, predictions=len(results["predictions"]))
+
+    return results
+
+
 # Ruta para realizar las predicciones
 @api_router.post("/predict", response_model=schemas.PredictionResults, status_code=200)
-async def predict(input_data: schemas.MultipleDataInputs) -> Any:
+async def predict(input_data: schemas.MultipleDataInputs, request: Request) -> Any:
     """
     Prediccion usando el modelo de bankchurn
     """
+    started = request_started(request.state)
+    # lectura del cuerpo, JSON y validación de pydantic, hechos por FastAPI
+    observe_since_start(state=request.state, stage="request_parse")
+
+    # los campos ya son tipos simples de JSON, no hace falta jsonable_encoder
+    with metrics.timed("request_dataframe"):
+        input_df = pd.DataFrame([row.__dict__ for row in input_data.inputs]).replace(
+            {np.nan: None}
+        )
 
-    input_df = pd.DataFrame(jsonable_encoder(input_data.inputs))
+    results = await score(
+        input_df, route="/predict", started=started, inputs=lambda: input_data.inputs
+    )
+    # se escribe directo, sin validar otra vez con PredictionResults
+    return FastJSONResponse(results)
 
-    logger.info(f"Making prediction on inputs: {input_data.inputs}")
-    results = make_prediction(input_data=input_df.replace({np.nan: None}))
 
-    if results["errors"] is not None:
-        logger.warning(f"Prediction validation error: {results.get('errors')}")
-        raise HTTPException(status_code=400, detail=json.loads(results["errors"]))
+# Formato columnar: una lista por variable en lugar de un objeto por fila, en
+# JSON o como tabla de Arrow (stream IPC) o Parquet. El cuerpo se decodifica
+# directo a un DataFrame, sin un objeto pydantic por fila; los valores se
+# validan igual en validate_inputs del modelo.
+@api_router.post(
+    "/predict/columnar",
+    response_model=schemas.PredictionResults,
+    status_code=200,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": schemas.ColumnarInputs.schema(),
+                    "example": schemas.ColumnarInputs.Config.schema_extra["example"],
+                },
+                ARROW_STREAM: {"schema": {"type": "string", "format": "binary"}},
+                PARQUET: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def predict_columnar(request: Request) -> Any:
+    """
+    Same as /predict with the inputs sent as columns,
+    {"inputs": {"bedrooms": [3.0, 4.0], "sqft_living": [3660, 2090], ...}},
+    or as an Arrow stream or Parquet table with one column per feature.
+    Binary requests get the predictions back as a table in the same format.
+    """
+    started = request_started(request.state)
+    fmt = binary_format(request)
+    with metrics.timed("request_parse"):
+        body = await request.body()
+        try:
+            if fmt is None:
+                input_df = columns_frame(loads(body))
+            else:
+                input_df = read_table(body=body, fmt=fmt)
+        except ImportError:
+            raise HTTPException(
+                status_code=415, detail=f"{fmt} bodies require pyarrow"
+            )
+        except ValueError as error:
+            detail = error.args[0] if error.args else str(error)
+            if not isinstance(detail, list):
+                # cuerpo que no es JSON, Arrow o Parquet válido
+                detail = [{"loc": ["body"], "msg": str(error), "type": "value_error"}]
+            raise HTTPException(status_code=422, detail=detail)
 
-    logger.info(f"Prediction results: {results.get('predictions')}")
+    results = await score(
+        input_df,
+        route="/predict/columnar",
+        started=started,
+        inputs=lambda: input_df.head(settings.logging.LOGGING_PAYLOAD_MAX_ITEMS)
+        .dropna(axis=1, how="all")
+        .to_dict(orient="records"),
+    )
+    if fmt is None:
+        return FastJSONResponse(results)
+    return Response(content=write_predictions(results=results, fmt=fmt), media_type=fmt)
 
-    return results
+
+# Predicción masiva: el cuerpo NDJSON o CSV se lee y evalúa por bloques, y las
+# predicciones de cada bloque se devuelven como una línea NDJSON
+@api_router.post("/predict/stream", status_code=200)
+async def predict_stream(request: Request) -> StreamingResponse:
+    """
+    Score a large upload without loading it whole. Each output line has
+    the offset of its chunk in the upload, its predictions and errors.
+    """
+    fmt = body_format(request)
+    if fmt is None:
+        raise HTTPException(
+            status_code=415, detail=f"Content-Type must be one of {STREAM_FORMATS}"
+        )
+
+    body = await spool_body(request=request, max_memory=settings.STREAM_SPOOL_BYTES)
+    logger.info("Streaming prediction on a {} upload", fmt)
+    return StreamingResponse(
+        stream_predictions(
+            body=body,
+            fmt=fmt,
+            config=settings,
+            started=request_started(request.state),
+        ),
+        media_type=NDJSON,
+    )
+
+
+# Resúmenes precalculados de los gráficos del tablero
+@api_router.get("/stats", status_code=200)
+def stats() -> Response:
+    """
+    Binned aggregates and quartiles of every dashboard chart, as written
+    by tablero/stats.py. The payload size doesn't grow with the dataset.
+    """
+    if settings.STATS_FILE is None:
+        raise HTTPException(status_code=404, detail="Stats are not configured")
+    try:
+        payload = stats_payload(settings.STATS_FILE)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Stats file not found")
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"Cache-Control": "max-age=300"},
+    )
+
+
+# Versiones del modelo disponibles y cambio de la versión activa en caliente
+@api_router.get("/models", response_model=schemas.ModelVersions, status_code=200)
+def models() -> dict:
+    return {"active": active_version(), "available": list_versions()}
+
+
+@api_router.put("/models/active", response_model=schemas.ModelVersions, status_code=200)
+async def activate_model(update: schemas.ModelVersionUpdate) -> Any:
+    """
+    Switch the model that serves /predict. Requests already being
+    scored finish with the previous version.
+    """
+    try:
+        active = await activate_version(version=update.version)
+    except ValueError as error:
+        raise HTTPException(status_code=404, detail=str(error))
+
+    logger.info("Active model version: {}", active)
+    return {"active": active, "available": list_versions()}
@@ -0,0 +1,73 @@
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+import pandas as pd
+
+from app.config import Settings, settings
+from app.scoring import run_batch_prediction
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent /predict requests into one model call.
+    Requests that arrive within `window` seconds of the first pending
+    one are scored together, and the batch is sent right away once it
+    reaches `max_size` rows. Each caller gets back its own result.
+    """
+
+    def __init__(self, *, window: float, max_size: int):
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[Tuple[pd.DataFrame, asyncio.Future]] = []
+        self._pending_rows = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, input_data: pd.DataFrame) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((input_data, future))
+        self._pending_rows += len(input_data)
+
+        if self._pending_rows >= self.max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._score(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, batch: List[Tuple[pd.DataFrame, asyncio.Future]]) -> None:
+        try:
+            results = await run_batch_prediction(inputs=[frame for frame, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_batcher: Optional[MicroBatcher] = None
+
+
+def get_batcher(config: Settings = settings) -> MicroBatcher:
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            window=config.BATCH_WINDOW_MS / 1000, max_size=config.BATCH_MAX_SIZE
+        )
+    return _batcher
@@ -1,7 +1,7 @@
 import logging
 import sys
 from types import FrameType
-from typing import List, cast
+from typing import List, Literal, Optional, cast
 
 from loguru import logger
 from pydantic import AnyHttpUrl, BaseSettings
@@ -9,6 +9,14 @@ from pydantic import AnyHttpUrl, BaseSettings
 # Nivel del logger
 class LoggingSettings(BaseSettings):
     LOGGING_LEVEL: int = logging.INFO  # logging levels are type int
+    # Los mensajes pasan por una cola y un hilo aparte escribe en stderr,
+    # así la petición no espera la escritura
+    LOGGING_ENQUEUE: bool = True
+    # Fracción de peticiones que registran sus entradas y predicciones
+    # (0 ninguna, 1 todas), recortadas a tantos elementos y caracteres
+    LOGGING_PAYLOAD_SAMPLE_RATE: float = 0.01
+    LOGGING_PAYLOAD_MAX_ITEMS: int = 5
+    LOGGING_PAYLOAD_MAX_CHARS: int = 2000
 
 # Configuración de raíz de la ruta, logger, CORS, nombre 
 class Settings(BaseSettings):
@@ -28,6 +36,30 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str = "House pricing WA, USA"
 
+    # Ejecución del modelo fuera del event loop: "thread" o "process".
+    # Con SCORING_WORKERS=None se usa el número por defecto de cada pool.
+    SCORING_BACKEND: Literal["thread", "process"] = "thread"
+    SCORING_WORKERS: Optional[int] = None
+
+    # Micro-batching: agrupa las peticiones que llegan dentro de la ventana
+    # (en milisegundos) hasta BATCH_MAX_SIZE filas y las evalúa en una sola llamada
+    BATCHING_ENABLED: bool = False
+    BATCH_WINDOW_MS: float = 2.0
+    BATCH_MAX_SIZE: int = 256
+
+    # /predict/stream: filas evaluadas por bloque y bytes del cuerpo que se
+    # guardan en memoria antes de pasar a un archivo temporal
+    STREAM_CHUNK_ROWS: int = 5000
+    STREAM_SPOOL_BYTES: int = 8 * 1024 * 1024
+
+    # Histogramas de tiempo por etapa, filas por llamada y errores en /metrics
+    # (formato de texto de Prometheus). Desactivados no agregan costo medible.
+    METRICS_ENABLED: bool = False
+
+    # JSON de estadísticas precalculadas del tablero (tablero/stats.py) que
+    # sirve /stats; sin archivo la ruta responde 404
+    STATS_FILE: Optional[str] = None
+
     class Config:
         case_sensitive = True
 
@@ -63,7 +95,13 @@ def setup_app_logging(config: Settings) -> None:
         logging_logger.handlers = [InterceptHandler(level=config.logging.LOGGING_LEVEL)]
 
     logger.configure(
-        handlers=[{"sink": sys.stderr, "level": config.logging.LOGGING_LEVEL}]
+        handlers=[
+            {
+                "sink": sys.stderr,
+                "level": config.logging.LOGGING_LEVEL,
+                "enqueue": config.logging.LOGGING_ENQUEUE,
+            }
+        ]
     )
 
 
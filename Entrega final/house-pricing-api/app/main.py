@@ -1,19 +1,39 @@
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
-from fastapi import APIRouter, FastAPI, Request
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from loguru import logger
+from model import metrics
+from model.predict import preload
 
 from app.api import api_router
 from app.config import settings, setup_app_logging
+from app.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware
+from app.scoring import shutdown_executor, start_executor
 
 # setup logging as early as possible
 setup_app_logging(config=settings)
 
 
+# El modelo se carga al arrancar y el pool de ejecución vive
+# lo mismo que la aplicación
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    metrics.enable(settings.METRICS_ENABLED)
+    preload()
+    start_executor(settings)
+    yield
+    shutdown_executor()
+    # escribe los mensajes que quedan en la cola del log
+    await logger.complete()
+
+
 app = FastAPI(
-    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 root_router = APIRouter()
@@ -36,6 +56,16 @@ def index(request: Request) -> Any:
     return HTMLResponse(content=body)
 
 
+# Métricas para Prometheus, solo con METRICS_ENABLED
+@root_router.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Any:
+    if not metrics.enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        content=metrics.REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 app.include_router(root_router)
 
@@ -49,6 +79,9 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Fuera de CORS, para medir la petición completa
+app.add_middleware(MetricsMiddleware)
+
 
 if __name__ == "__main__":
     # Use this for debugging purposes only
@@ -0,0 +1,76 @@
+import time
+from typing import Any, MutableMapping
+
+from model import metrics
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Métricas HTTP de la API, en el mismo registro que las etapas del modelo.
+# Con el pool de procesos las etapas del modelo se miden dentro de los
+# workers y no llegan a /metrics; las de la API sí.
+REQUESTS = metrics.REGISTRY.register(
+    metrics.Counter(
+        "house_pricing_http_requests_total",
+        "HTTP requests by route and status code.",
+        labels=("route", "status"),
+    )
+)
+REQUEST_SECONDS = metrics.REGISTRY.register(
+    metrics.Histogram(
+        "house_pricing_http_request_seconds",
+        "HTTP request latency by route.",
+        buckets=metrics.SECONDS_BUCKETS,
+        labels=("route",),
+    )
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    """
+    Count requests and time them by route template, so that path
+    parameters don't create new series. The start time is left in the
+    request state, also with metrics disabled, for the handlers to time
+    their own stages and log their latency from it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        scope.setdefault("state", {})["request_start"] = start
+        if not metrics.enabled():
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_status(message: MutableMapping[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUESTS.inc(route, str(status))
+            REQUEST_SECONDS.observe(time.perf_counter() - start, route)
+
+
+def request_started(state: Any) -> float:
+    """Time the request arrived, or now if it didn't go through the middleware."""
+    start = getattr(state, "request_start", None)
+    return time.perf_counter() if start is None else start
+
+
+def observe_since_start(*, state: Any, stage: str) -> None:
+    """Record the time from the start of the request until now under `stage`."""
+    start = getattr(state, "request_start", None)
+    if start is not None:
+        metrics.STAGE_SECONDS.observe(time.perf_counter() - start, stage)
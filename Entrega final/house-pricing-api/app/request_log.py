@@ -0,0 +1,63 @@
+import random
+import time
+from typing import Any, Callable, Optional, Sequence
+
+from loguru import logger
+
+from app.config import LoggingSettings, settings
+
+# Cada petición deja un resumen estructurado (filas, latencia, versión) y solo
+# una muestra de las peticiones deja también sus entradas y predicciones,
+# recortadas. Los mensajes se formatean solo si el nivel está activo. La
+# latencia se mide desde que llega la petición, antes de leer el cuerpo.
+
+
+def sample_payload(config: LoggingSettings = settings.logging) -> bool:
+    """Whether this request's payload goes to the log."""
+    rate = config.LOGGING_PAYLOAD_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def truncate(
+    items: Sequence[Any], config: LoggingSettings = settings.logging
+) -> str:
+    """Text of the first items, cut to LOGGING_PAYLOAD_MAX_CHARS."""
+    shown = list(items[: config.LOGGING_PAYLOAD_MAX_ITEMS])
+    text = repr(shown)
+    if len(items) > len(shown):
+        text += f" ... ({len(items) - len(shown)} more)"
+    if len(text) > config.LOGGING_PAYLOAD_MAX_CHARS:
+        text = text[: config.LOGGING_PAYLOAD_MAX_CHARS] + " ... (truncated)"
+    return text
+
+
+def log_payload(label: str, items: Callable[[], Sequence[Any]]) -> None:
+    """Log a truncated payload; `items` is only called if INFO is enabled."""
+    logger.opt(lazy=True).info(label + ": {}", lambda: truncate(items()))
+
+
+def log_summary(
+    *,
+    route: str,
+    rows: int,
+    predictions: int,
+    version: Optional[str],
+    started: float,
+    errors: int = 0,
+) -> None:
+    """One line per request; the fields also go to the record's extra."""
+    summary = {
+        "route": route,
+        "rows": rows,
+        "predictions": predictions,
+        "errors": errors,
+        "version": version,
+        "latency_ms": round(1000 * (time.perf_counter() - started), 3),
+    }
+    level = "WARNING" if errors else "INFO"
+    logger.log(
+        level,
+        "{route}: {rows} rows, {predictions} predictions, {errors} errors, "
+        "model {version}, {latency_ms} ms",
+        **summary,
+    )
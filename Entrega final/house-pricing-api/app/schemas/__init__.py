@@ -1,2 +1,3 @@
 from .health import Health
-from .predict import MultipleDataInputs, PredictionResults
+from .predict import ColumnarInputs, MultipleDataInputs, PredictionResults
+from .versions import ModelVersions, ModelVersionUpdate
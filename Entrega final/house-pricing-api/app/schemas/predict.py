@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 from model.processing.validation import DataInputSchema
@@ -9,7 +9,8 @@ class PredictionResults(BaseModel):
     version: str
     predictions: Optional[List[float]]
 
-# Esquema para inputs múltiples. Debe predecir 13.635679994241398 en el ejemplo
+# Esquema para inputs múltiples. Debe predecir 13.635679994241398 en el ejemplo.
+# La ciudad puede enviarse como "city" (nombre o código) o con las columnas city_*
 class MultipleDataInputs(BaseModel):
     inputs: List[DataInputSchema]
 
@@ -30,50 +31,34 @@ class MultipleDataInputs(BaseModel):
                         "sqft_basement": 400,
                         "yr_built": 1989,
                         "yr_renovated": False,
-                        "city_Algona": False,
-                        "city_Auburn": False,
-                        "city_Beaux_Arts_Village": False,
-                        "city_Bellevue": False,
-                        "city_Black_Diamond": False,
-                        "city_Bothell": False,
-                        "city_Burien": False,
-                        "city_Carnation": False,
-                        "city_Clyde_Hill": False,
-                        "city_Covington": False,
-                        "city_Des_Moines": False,
-                        "city_Duvall": False,
-                        "city_Enumclaw": True,
-                        "city_Fall_City": False,
-                        "city_Federal_Way": False,
-                        "city_Issaquah": False,
-                        "city_Kenmore": False,
-                        "city_Kent": False,
-                        "city_Kirkland": False,
-                        "city_Lake_Forest_Park": False,
-                        "city_Maple_Valley": False,
-                        "city_Medina": False,
-                        "city_Mercer_Island": False,
-                        "city_Milton": False,
-                        "city_Newcastle": False,
-                        "city_Normandy_Park": False,
-                        "city_North_Bend": False,
-                        "city_Pacific": False,
-                        "city_Preston": False,
-                        "city_Ravensdale": False,
-                        "city_Redmond": False,
-                        "city_Renton": False,
-                        "city_Sammamish": False,
-                        "city_SeaTac": False,
-                        "city_Seattle": False,
-                        "city_Shoreline": False,
-                        "city_Skykomish": False,
-                        "city_Snoqualmie": False,
-                        "city_Snoqualmie_Pass": False,
-                        "city_Tukwila": False,
-                        "city_Vashon": False,
-                        "city_Woodinville": False,
-                        "city_Yarrow_Point": False
+                        "city": "Enumclaw"
                     }
                 ]
             }
         }
+
+# Mismos datos en formato columnar: una lista de valores por variable, todas
+# del mismo largo. Las variables que falten se toman como vacías.
+class ColumnarInputs(BaseModel):
+    inputs: Dict[str, List[Any]]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "inputs": {
+                    "bedrooms": [3.0, 4.0],
+                    "bathrooms": [2.5, 2.5],
+                    "sqft_living": [3660, 2090],
+                    "sqft_lot": [39478, 5195],
+                    "floors": [2.0, 2.0],
+                    "waterfront": [0, 0],
+                    "view": [2, 0],
+                    "condition": [4, 3],
+                    "sqft_above": [3260, 2090],
+                    "sqft_basement": [400, 0],
+                    "yr_built": [1989, 2007],
+                    "yr_renovated": [0, 0],
+                    "city": ["Enumclaw", "Kent"],
+                }
+            }
+        }
@@ -0,0 +1,12 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ModelVersions(BaseModel):
+    active: str
+    available: List[str]
+
+
+class ModelVersionUpdate(BaseModel):
+    version: str
@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional
+
+import pandas as pd
+from model.predict import (
+    activate,
+    active_version,
+    make_prediction,
+    make_predictions,
+    preload,
+)
+
+from app.config import Settings, settings
+
+# Pool que ejecuta el modelo por fuera del event loop de uvicorn
+_executor: Optional[Executor] = None
+
+
+def create_executor(config: Settings) -> Executor:
+    """Build the scoring pool selected in the settings."""
+
+    if config.SCORING_BACKEND == "process":
+        return ProcessPoolExecutor(
+            max_workers=config.SCORING_WORKERS, initializer=preload
+        )
+    return ThreadPoolExecutor(
+        max_workers=config.SCORING_WORKERS, thread_name_prefix="scoring"
+    )
+
+
+def start_executor(config: Settings) -> Executor:
+    global _executor
+    if _executor is None:
+        _executor = create_executor(config)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+# Las peticiones llevan la versión activa del proceso principal al enviarse:
+# se evalúan con esa versión aunque se cambie el modelo mientras esperan, y
+# los workers de un pool de procesos pasan a la nueva en la siguiente llamada
+async def run_prediction(*, input_data: pd.DataFrame) -> dict:
+    """Score a batch on the pool, so the event loop keeps serving requests."""
+
+    executor = start_executor(settings)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        partial(make_prediction, input_data=input_data, version=active_version()),
+    )
+
+
+async def run_batch_prediction(*, inputs: List[pd.DataFrame]) -> List[dict]:
+    """Score several requests in one model call on the pool."""
+
+    executor = start_executor(settings)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, partial(make_predictions, inputs=inputs, version=active_version())
+    )
+
+
+async def activate_version(*, version: str) -> str:
+    """Load a model version off the event loop and make it the active one."""
+
+    loop = asyncio.get_running_loop()
+    model = await loop.run_in_executor(None, partial(activate, version=version))
+    return model.version
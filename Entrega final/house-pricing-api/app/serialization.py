@@ -0,0 +1,124 @@
+import json
+from typing import Any, List, Optional
+
+import pandas as pd
+from fastapi.responses import JSONResponse
+from model.processing.validation import DataInputSchema
+from starlette.requests import Request
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# JSON rápido para /predict: orjson si está instalado (3-10 veces más rápido
+# que json), y la respuesta se escribe directamente sin pasar otra vez por
+# el response_model de pydantic.
+
+# Cuerpos binarios de /predict/columnar (requieren pyarrow). La respuesta
+# se devuelve en el mismo formato de la petición.
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+BINARY_FORMATS = {
+    ARROW_STREAM: ARROW_STREAM,
+    PARQUET: PARQUET,
+    "application/x-parquet": PARQUET,
+}
+
+
+def loads(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def binary_format(request: Request) -> Optional[str]:
+    """Arrow or Parquet format of the request body, or None for JSON."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    return BINARY_FORMATS.get(content_type.lower())
+
+
+def schema_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Frame with the columns of DataInputSchema, missing ones as None."""
+    return frame.reindex(columns=list(DataInputSchema.__fields__))
+
+
+def read_table(*, body: bytes, fmt: str) -> pd.DataFrame:
+    """
+    Decode an Arrow stream or Parquet body column by column into a
+    DataFrame. Arrow buffers are read in place from the request body.
+    Raises ValueError (pyarrow.ArrowInvalid) for a corrupt body.
+    """
+    import pyarrow as pa
+
+    if fmt == ARROW_STREAM:
+        with pa.ipc.open_stream(pa.py_buffer(body)) as reader:
+            table = reader.read_all()
+    else:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(pa.BufferReader(body))
+    return schema_frame(table.to_pandas())
+
+
+def write_predictions(*, results: dict, fmt: str) -> bytes:
+    """
+    Predictions as a one column table ("prediction") in `fmt`, with the
+    model version in the schema metadata, as model-score writes them.
+    """
+    import pyarrow as pa
+
+    table = pa.table({"prediction": pa.array(results["predictions"], pa.float64())})
+    table = table.replace_schema_metadata({"model_version": results["version"]})
+    sink = pa.BufferOutputStream()
+    if fmt == ARROW_STREAM:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
+
+
+def columnar_error(msg: str, *loc: Any) -> List[dict]:
+    return [{"loc": ["body", "inputs", *loc], "msg": msg, "type": "value_error"}]
+
+
+def columns_frame(payload: Any) -> pd.DataFrame:
+    """
+    DataFrame of a columnar body, {"inputs": {"feature": [values, ...]}},
+    with the columns of DataInputSchema (missing ones as None) like the
+    frame built from row records. Values are checked later by the model
+    validation; a body of the wrong shape raises ValueError with the
+    error details.
+    """
+    inputs = payload.get("inputs") if isinstance(payload, dict) else None
+    if not isinstance(inputs, dict):
+        raise ValueError(columnar_error("inputs should be an object of columns"))
+
+    fields = DataInputSchema.__fields__
+    columns = {name: values for name, values in inputs.items() if name in fields}
+    lengths = set()
+    for name, values in columns.items():
+        if not isinstance(values, list):
+            raise ValueError(columnar_error("column should be a list", name))
+        lengths.add(len(values))
+    if len(lengths) > 1:
+        raise ValueError(columnar_error("columns should have the same length"))
+
+    rows = lengths.pop() if lengths else 0
+    return schema_frame(pd.DataFrame(columns, index=pd.RangeIndex(rows)))
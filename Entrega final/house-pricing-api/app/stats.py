@@ -0,0 +1,16 @@
+import os
+from typing import Dict, Tuple
+
+# Estadísticas precalculadas del tablero (tablero/stats.py), servidas tal como
+# están en el archivo. Se vuelven a leer solo cuando el archivo cambia.
+_cache: Dict[str, Tuple[int, bytes]] = {}
+
+
+def stats_payload(path: str) -> bytes:
+    """Contents of the stats file; raises OSError if it can't be read."""
+    modified = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached is None or cached[0] != modified:
+        with open(path, "rb") as stats_file:
+            cached = _cache[path] = (modified, stats_file.read())
+    return cached[1]
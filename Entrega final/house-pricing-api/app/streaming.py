@@ -0,0 +1,125 @@
+import asyncio
+import json
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncIterator, Iterator, Optional
+
+import pandas as pd
+from model.processing.validation import DataInputSchema
+from starlette.requests import Request
+
+from app.config import Settings
+from app.request_log import log_summary
+from app.scoring import run_prediction
+
+# Formatos aceptados por /predict/stream, según el Content-Type
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+STREAM_FORMATS = (NDJSON, CSV)
+
+
+def body_format(request: Request) -> Optional[str]:
+    """Upload format of the request, or None if it is not supported."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    return content_type if content_type in STREAM_FORMATS else None
+
+
+async def spool_body(*, request: Request, max_memory: int) -> IO[bytes]:
+    """
+    Copy the request body to a temporary file that stays in memory up to
+    `max_memory` bytes and moves to disk beyond that. The body has to be
+    read before the response starts, Starlette listens for disconnects
+    on the same channel while it streams.
+    """
+    body = SpooledTemporaryFile(max_size=max_memory)
+    async for data in request.stream():
+        body.write(data)
+    body.seek(0)
+    return body
+
+
+def read_chunks(
+    *, body: IO[bytes], fmt: str, chunk_rows: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Parse the upload `chunk_rows` records at a time. Every chunk has
+    the columns of DataInputSchema, missing ones as None, the same
+    frame /predict builds from a JSON body.
+    """
+    if fmt == NDJSON:
+        reader = pd.read_json(
+            body, lines=True, chunksize=chunk_rows, dtype=False, convert_dates=False
+        )
+    else:
+        reader = pd.read_csv(body, chunksize=chunk_rows)
+
+    columns = list(DataInputSchema.__fields__)
+    with reader:
+        for chunk in reader:
+            chunk = chunk.reindex(columns=columns).reset_index(drop=True)
+            yield chunk.astype(object).where(chunk.notna(), None)
+
+
+def shift_errors(*, errors: str, offset: int) -> list:
+    """Error locations of a chunk, as row numbers of the whole upload."""
+    shifted = json.loads(errors)
+    for error in shifted:
+        loc = error.get("loc", [])
+        if len(loc) > 1 and isinstance(loc[1], int):
+            loc[1] += offset
+    return shifted
+
+
+async def stream_predictions(
+    *, body: IO[bytes], fmt: str, config: Settings, started: float
+) -> AsyncIterator[bytes]:
+    """
+    Score an NDJSON or CSV upload chunk by chunk and yield one NDJSON
+    line per chunk as soon as it is scored. Only one chunk of rows is
+    held in memory at a time. The request summary is logged when the
+    stream ends.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = read_chunks(body=body, fmt=fmt, chunk_rows=config.STREAM_CHUNK_ROWS)
+    offset = 0
+    summary = {"predictions": 0, "errors": 0, "version": None}
+
+    try:
+        while True:
+            try:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+            except ValueError as error:
+                # el resto del cuerpo no se puede leer: se informa y se corta el stream
+                parse_error = {"loc": ["body", offset], "msg": str(error)}
+                line = {
+                    "offset": offset,
+                    "rows": 0,
+                    "predictions": None,
+                    "version": None,
+                    "errors": [{**parse_error, "type": "value_error.parse"}],
+                }
+                summary["errors"] += 1
+                yield (json.dumps(line) + "\n").encode()
+                return
+            if chunk is None:
+                return
+
+            results = await run_prediction(input_data=chunk)
+            errors = results["errors"]
+            if errors:
+                errors = shift_errors(errors=errors, offset=offset)
+            summary["predictions"] += len(results["predictions"] or ())
+            summary["errors"] += len(errors or ())
+            summary["version"] = results["version"]
+            line = {
+                "offset": offset,
+                "rows": len(chunk),
+                "predictions": results["predictions"],
+                "version": results["version"],
+                "errors": errors,
+            }
+            offset += len(chunk)
+            yield (json.dumps(line) + "\n").encode()
+    finally:
+        chunks.close()
+        body.close()
+        log_summary(route="/predict/stream", rows=offset, started=started, **summary)
@@ -1,8 +1,28 @@
+import asyncio
+import importlib.util
+import json
 import math
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
 from fastapi.testclient import TestClient
+from loguru import logger
+from model import __version__ as model_version
+from model import metrics
+from model.predict import make_predictions
+from model.processing import data_manager
+
+from app.batching import MicroBatcher
+from app.config import settings
+from app.main import app
+from app.scoring import run_batch_prediction
 
 
 def test_make_prediction(client: TestClient, test_data: pd.DataFrame) -> None:
@@ -24,3 +44,378 @@ def test_make_prediction(client: TestClient, test_data: pd.DataFrame) -> None:
     assert prediction_data["predictions"]
     assert prediction_data["errors"] is None
     assert math.isclose(prediction_data["predictions"][0], 1228, rel_tol=100)
+
+
+def test_make_prediction_with_compact_city(
+    client: TestClient, test_data: pd.DataFrame
+) -> None:
+    # Given
+    city_columns = [var for var in test_data.columns if var.startswith("city_")]
+    one_hot = test_data.drop(columns=["price"]).iloc[:20]
+    compact = one_hot.drop(columns=city_columns).assign(
+        city=one_hot[city_columns].to_numpy().argmax(axis=1)
+    )
+
+    # When
+    expected = client.post(
+        "http://localhost:8001/api/v1/predict",
+        json={"inputs": one_hot.to_dict(orient="records")},
+    )
+    response = client.post(
+        "http://localhost:8001/api/v1/predict",
+        json={"inputs": compact.to_dict(orient="records")},
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert response.json()["errors"] is None
+    assert response.json()["predictions"] == expected.json()["predictions"]
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_make_prediction_scoring_backends(
+    backend: str, test_data: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Given
+    monkeypatch.setattr(settings, "SCORING_BACKEND", backend)
+    monkeypatch.setattr(settings, "SCORING_WORKERS", 2)
+    payload = {"inputs": test_data.iloc[:10].to_dict(orient="records")}
+
+    # When
+    with TestClient(app) as client:
+        response = client.post("http://localhost:8001/api/v1/predict", json=payload)
+
+    # Then
+    assert response.status_code == 200
+    assert len(response.json()["predictions"]) == 10
+
+
+def test_micro_batcher_coalesces_concurrent_requests(
+    test_data: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Given
+    batch_sizes = []
+
+    async def counting_batch_prediction(*, inputs: list) -> list:
+        batch_sizes.append(len(inputs))
+        return await run_batch_prediction(inputs=inputs)
+
+    monkeypatch.setattr("app.batching.run_batch_prediction", counting_batch_prediction)
+    batcher = MicroBatcher(window=0.05, max_size=1000)
+    requests = [test_data.iloc[[i]] for i in range(8)]
+
+    async def submit_all() -> list:
+        return await asyncio.gather(*(batcher.submit(frame) for frame in requests))
+
+    # When
+    results = asyncio.run(submit_all())
+
+    # Then
+    assert batch_sizes == [8]
+    expected = make_predictions(inputs=requests)
+    assert [result["predictions"] for result in results] == [
+        result["predictions"] for result in expected
+    ]
+
+
+def test_switch_active_model_version(
+    client: TestClient,
+    test_data: pd.DataFrame,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given
+    model_file = data_manager.TRAINED_MODEL_DIR / data_manager.model_file_name()
+    shutil.copy(model_file, tmp_path)
+    monkeypatch.setattr(data_manager, "TRAINED_MODEL_DIR", tmp_path)
+    monkeypatch.setattr("model.predict._active", None)
+    monkeypatch.setattr("model.predict._loaded", OrderedDict())
+    pipeline = data_manager.load_pipeline(file_name=data_manager.model_file_name())
+    data_manager.save_pipeline(pipeline_to_persist=pipeline, version="0.0.2")
+    payload = {"inputs": test_data.iloc[:5].to_dict(orient="records")}
+
+    # When
+    before = client.post("http://localhost:8001/api/v1/predict", json=payload)
+    switched = client.put(
+        "http://localhost:8001/api/v1/models/active", json={"version": "0.0.2"}
+    )
+    after = client.post("http://localhost:8001/api/v1/predict", json=payload)
+    missing = client.put(
+        "http://localhost:8001/api/v1/models/active", json={"version": "9.9.9"}
+    )
+
+    # Then
+    assert switched.status_code == 200
+    assert switched.json() == {"active": "0.0.2", "available": [model_version, "0.0.2"]}
+    assert before.json()["version"] == model_version
+    assert after.json()["version"] == "0.0.2"
+    assert after.json()["predictions"] == before.json()["predictions"]
+    assert missing.status_code == 404
+    assert client.get("http://localhost:8001/api/v1/models").json()["active"] == "0.0.2"
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_predict_stream_scores_upload_in_chunks(
+    fmt: str,
+    client: TestClient,
+    test_data: pd.DataFrame,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given
+    monkeypatch.setattr(settings, "STREAM_CHUNK_ROWS", 40)
+    upload = test_data.drop(columns=["price"]).iloc[:100].copy()
+    upload["view"] = upload["view"].astype(object)
+    upload.loc[upload.index[55], "view"] = "high"
+    if fmt == "ndjson":
+        body = upload.to_json(orient="records", lines=True)
+        content_type = "application/x-ndjson"
+    else:
+        body = upload.to_csv(index=False)
+        content_type = "text/csv"
+    records: list = []
+    sink = logger.add(lambda message: records.append(message.record), level="INFO")
+
+    # When
+    try:
+        response = client.post(
+            "http://localhost:8001/api/v1/predict/stream",
+            content=body,
+            headers={"Content-Type": content_type},
+        )
+    finally:
+        logger.remove(sink)
+    expected = client.post(
+        "http://localhost:8001/api/v1/predict",
+        json={"inputs": upload.iloc[:40].to_dict(orient="records")},
+    )
+
+    # Then
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["offset"] for line in lines] == [0, 40, 80]
+    assert [line["rows"] for line in lines] == [40, 40, 20]
+    assert lines[0]["predictions"] == pytest.approx(expected.json()["predictions"])
+    assert lines[1]["predictions"] is None
+    assert [error["loc"] for error in lines[1]["errors"]] == [["inputs", 55, "view"]]
+    assert len(lines[2]["predictions"]) == 20
+    summary = next(
+        record["extra"]
+        for record in records
+        if record["extra"].get("route") == "/predict/stream"
+    )
+    assert summary["rows"] == 100
+    assert summary["predictions"] == 60
+    assert summary["errors"] == 1
+    assert summary["version"] == model_version
+    assert summary["latency_ms"] > 0
+
+
+def test_predict_stream_rejects_unknown_content_type(client: TestClient) -> None:
+    # When
+    response = client.post(
+        "http://localhost:8001/api/v1/predict/stream",
+        content=b"{}",
+        headers={"Content-Type": "application/json"},
+    )
+
+    # Then
+    assert response.status_code == 415
+
+
+def test_metrics_endpoint(
+    test_data: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Given
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    metrics.REGISTRY.clear()
+    payload = {"inputs": test_data.iloc[:10].to_dict(orient="records")}
+
+    # When
+    with TestClient(app) as client:
+        client.post("http://localhost:8001/api/v1/predict", json=payload)
+        client.post(
+            "http://localhost:8001/api/v1/predict",
+            json={"inputs": [{"city": "Atlantis"}]},
+        )
+        response = client.get("http://localhost:8001/metrics")
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    with TestClient(app) as client:
+        disabled = client.get("http://localhost:8001/metrics")
+
+    # Then
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    for stage in ("request_parse", "request_dataframe", "request_score", "predict"):
+        assert f'house_pricing_stage_seconds_count{{stage="{stage}"}}' in text
+    assert 'house_pricing_batch_rows_bucket{le="1"} 1' in text
+    assert 'house_pricing_batch_rows_bucket{le="10"} 2' in text
+    assert 'house_pricing_prediction_errors_total{stage="validate_inputs"} 1' in text
+    assert (
+        'house_pricing_http_requests_total{route="/api/v1/predict",status="400"} 1'
+        in text
+    )
+    assert disabled.status_code == 404
+
+
+def test_make_prediction_columnar(client: TestClient, test_data: pd.DataFrame) -> None:
+    # Given
+    inputs = test_data.drop(columns=["price"]).iloc[:20]
+    columns = inputs.to_dict(orient="list")
+
+    # When
+    expected = client.post(
+        "http://localhost:8001/api/v1/predict",
+        json={"inputs": inputs.to_dict(orient="records")},
+    )
+    response = client.post(
+        "http://localhost:8001/api/v1/predict/columnar", json={"inputs": columns}
+    )
+    invalid = client.post(
+        "http://localhost:8001/api/v1/predict/columnar",
+        json={"inputs": {**columns, "view": ["high"] * 20}},
+    )
+    ragged = client.post(
+        "http://localhost:8001/api/v1/predict/columnar",
+        json={"inputs": {**columns, "view": [0]}},
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert response.json() == expected.json()
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"][0]["loc"] == ["inputs", 0, "view"]
+    assert ragged.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    ["application/vnd.apache.arrow.stream", "application/vnd.apache.parquet"],
+)
+def test_make_prediction_arrow_and_parquet(
+    content_type: str, client: TestClient, test_data: pd.DataFrame
+) -> None:
+    # Given
+    inputs = test_data.drop(columns=["price"]).iloc[:20]
+    table = pa.Table.from_pandas(inputs, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    if content_type.endswith("parquet"):
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    # When
+    expected = client.post(
+        "http://localhost:8001/api/v1/predict",
+        json={"inputs": inputs.to_dict(orient="records")},
+    )
+    response = client.post(
+        "http://localhost:8001/api/v1/predict/columnar",
+        content=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": content_type},
+    )
+    corrupt = client.post(
+        "http://localhost:8001/api/v1/predict/columnar",
+        content=b"not a table",
+        headers={"Content-Type": content_type},
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert response.headers["content-type"] == content_type
+    if content_type.endswith("parquet"):
+        result = pq.read_table(pa.BufferReader(response.content))
+    else:
+        result = pa.ipc.open_stream(response.content).read_all()
+    assert result.column("prediction").to_pylist() == expected.json()["predictions"]
+    assert result.schema.metadata[b"model_version"] == model_version.encode()
+    assert corrupt.status_code == 422
+
+
+@pytest.mark.parametrize("sample_rate", [0.0, 1.0])
+def test_request_logging_is_sampled_and_truncated(
+    sample_rate: float,
+    client: TestClient,
+    test_data: pd.DataFrame,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given
+    monkeypatch.setattr(settings.logging, "LOGGING_PAYLOAD_SAMPLE_RATE", sample_rate)
+    monkeypatch.setattr(settings.logging, "LOGGING_PAYLOAD_MAX_CHARS", 300)
+    records: list = []
+    sink = logger.add(lambda message: records.append(message.record), level="INFO")
+    payload = {"inputs": test_data.iloc[:50].to_dict(orient="records")}
+
+    # When
+    try:
+        client.post("http://localhost:8001/api/v1/predict", json=payload)
+    finally:
+        logger.remove(sink)
+
+    # Then
+    summary = next(record for record in records if "route" in record["extra"])
+    assert summary["extra"]["route"] == "/predict"
+    assert summary["extra"]["rows"] == 50
+    assert summary["extra"]["version"] == model_version
+    assert summary["extra"]["latency_ms"] > 0
+    payloads = [
+        record["message"] for record in records if "Prediction" in record["message"]
+    ]
+    if sample_rate:
+        assert len(payloads) == 2
+        assert all(len(message) < 400 for message in payloads)
+        assert payloads[1].endswith("(45 more)")
+    else:
+        assert payloads == []
+
+
+def test_stats_serves_precomputed_file(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Given
+    stats_file = tmp_path / "data_graphs_stats.json"
+    stats_file.write_text(json.dumps({"rows": 10, "charts": []}))
+
+    # When
+    missing = client.get("http://localhost:8001/api/v1/stats")
+    monkeypatch.setattr(settings, "STATS_FILE", str(stats_file))
+    response = client.get("http://localhost:8001/api/v1/stats")
+
+    # Then
+    assert missing.status_code == 404
+    assert response.status_code == 200
+    assert response.json() == {"rows": 10, "charts": []}
+
+
+def strict_json(text: str) -> Any:
+    """json.loads that rejects NaN and Infinity, like browsers do."""
+
+    def reject(constant: str) -> None:
+        raise ValueError(f"{constant} is not valid JSON")
+
+    return json.loads(text, parse_constant=reject)
+
+
+def test_stats_built_by_dashboard_are_strict_json(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Given
+    tablero = Path(__file__).resolve().parents[3] / "tablero"
+    spec = importlib.util.spec_from_file_location("tablero_stats", tablero / "stats.py")
+    builder = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(builder)
+    stats_file = tmp_path / "data_graphs_stats.json"
+    builder.cargar_stats(str(tablero / builder.DATA_FILE), str(stats_file))
+    monkeypatch.setattr(settings, "STATS_FILE", str(stats_file))
+
+    # When
+    response = client.get("http://localhost:8001/api/v1/stats")
+    committed = (tablero / builder.STATS_FILE).read_text()
+
+    # Then
+    assert response.status_code == 200
+    stats = strict_json(response.text)
+    assert stats["rows"] > 0
+    assert any(None in chart.get("p50", []) for chart in stats["charts"])
+    assert strict_json(committed)["key"] == stats["key"]
@@ -0,0 +1,170 @@
+# Throughput de /api/v1/predict de punta a punta sobre la app ASGI (sin red):
+# parsing JSON, pydantic, DataFrame, modelo y serialización de la respuesta.
+# Uso: PYTHONPATH=. python benchmarks/bench_api.py --json api.json
+#      PYTHONPATH=. python benchmarks/bench_api.py --compare api.json
+#      PYTHONPATH=. python benchmarks/bench_api.py --format columnar
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import httpx
+from model.config.core import config
+from model.processing.data_manager import load_dataset
+
+from app.config import settings
+from app.main import app
+
+URLS = {
+    "rows": f"http://bench{settings.API_V1_STR}/predict",
+    "columnar": f"http://bench{settings.API_V1_STR}/predict/columnar",
+}
+
+
+async def bench_case(
+    *,
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    rows: int,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    latencies: List[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker() -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.post(url, json=payload)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rows_per_request": rows,
+        "concurrency": concurrency,
+        "requests": requests,
+        "requests_per_s": requests / elapsed,
+        "rows_per_s": requests * rows / elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+async def run(
+    *, batch_sizes: List[int], concurrency: List[int], requests: int, fmt: str
+) -> List[dict]:
+    sample = load_dataset(file_name=config.app_config.test_data_file)
+    sample = sample.drop(columns=[config.model.target])
+    results = []
+
+    # lifespan de la app: carga el modelo y arranca el pool de scoring
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, timeout=None) as client:
+            for rows in batch_sizes:
+                batch = sample.sample(n=rows, replace=True, random_state=0)
+                orient = "list" if fmt == "columnar" else "records"
+                payload = {"inputs": batch.to_dict(orient=orient)}
+                case = {"client": client, "url": URLS[fmt], "payload": payload}
+                # calentamiento
+                await bench_case(**case, rows=rows, requests=5, concurrency=1)
+                for workers in concurrency:
+                    result = await bench_case(
+                        **case,
+                        rows=rows,
+                        requests=requests,
+                        concurrency=workers,
+                    )
+                    results.append(result)
+                    print(
+                        f"{rows:>6} rows x{workers:<3}"
+                        f"{result['requests_per_s']:>9.1f} req/s"
+                        f"{result['rows_per_s']:>11.0f} rows/s"
+                        f"   p50 {result['p50_ms']:.2f} ms"
+                        f"   p99 {result['p99_ms']:.2f} ms"
+                    )
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def compare(*, results: List[dict], baseline_file: str) -> None:
+    """Print the change in throughput against a previous run."""
+    with open(baseline_file) as baseline:
+        previous = {
+            (result["rows_per_request"], result["concurrency"]): result
+            for result in json.load(baseline)["results"]
+        }
+    print(f"\nchange vs {baseline_file} (requests/s, + is faster)")
+    for result in results:
+        before = previous.get((result["rows_per_request"], result["concurrency"]))
+        if before is not None:
+            change = result["requests_per_s"] / before["requests_per_s"] - 1
+            rows, workers = result["rows_per_request"], result["concurrency"]
+            print(f"{rows:>6} rows x{workers:<3} {change:>+8.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=[1, 100, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 8])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--format", choices=sorted(URLS), default="rows")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="previous results")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(
+            batch_sizes=args.batch_sizes,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            fmt=args.format,
+        )
+    )
+
+    if args.json:
+        report = {
+            "benchmark": "api",
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "format": args.format,
+            "settings": {
+                "SCORING_BACKEND": settings.SCORING_BACKEND,
+                "SCORING_WORKERS": settings.SCORING_WORKERS,
+                "BATCHING_ENABLED": settings.BATCHING_ENABLED,
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.compare:
+        compare(results=results, baseline_file=args.compare)
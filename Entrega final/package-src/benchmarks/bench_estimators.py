@@ -0,0 +1,101 @@
+# Entrena cada estimador registrado con sus hiperparámetros de config.yml y compara
+# tiempo de entrenamiento, latencia de inferencia y error sobre el conjunto de prueba.
+# Uso: python benchmarks/bench_estimators.py --max-rmse 0.30 --json estimadores.json
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from model.config.core import config
+from model.estimators import ESTIMATORS, build_estimator
+from model.processing.data_manager import load_training_data
+
+
+def time_call(func, *, repeat: int) -> float:
+    """Median wall time of func() in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_estimator(*, name: str, data: dict, repeat: int) -> dict:
+    estimator = build_estimator(
+        name=name,
+        params=config.model.estimator_params.get(name),
+        random_state=config.model.random_state,
+    )
+    X_test, y_test = data["X_test"], data["y_test"]
+
+    start = time.perf_counter()
+    estimator.fit(data["X_train"], data["y_train"])
+    fit_seconds = time.perf_counter() - start
+
+    y_pred = estimator.predict(X_test)
+    single_row = X_test.iloc[:1]
+    return {
+        "estimator": name,
+        "fit_s": fit_seconds,
+        "predict_1_ms": 1000 * time_call(lambda: estimator.predict(single_row), repeat=repeat),
+        "predict_batch_ms": 1000 * time_call(lambda: estimator.predict(X_test), repeat=repeat),
+        "batch_rows": len(X_test),
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        "mae": float(mean_absolute_error(y_test, y_pred)),
+        "r2": float(r2_score(y_test, y_pred)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--estimators", nargs="*", default=sorted(ESTIMATORS))
+    parser.add_argument("--reference", default=config.model.estimator)
+    parser.add_argument("--max-rmse", type=float, default=None, help="error target")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    X_train, y_train = load_training_data(file_name=config.app_config.train_data_file)
+    X_test, y_test = load_training_data(file_name=config.app_config.test_data_file)
+    data = {"X_train": X_train, "y_train": y_train, "X_test": X_test, "y_test": y_test}
+
+    results = []
+    for name in args.estimators:
+        try:
+            results.append(bench_estimator(name=name, data=data, repeat=args.repeat))
+        except ImportError as error:
+            print(f"{name}: skipped ({error})")
+
+    # Paridad contra el estimador de referencia y cumplimiento del objetivo de error
+    reference = next((r for r in results if r["estimator"] == args.reference), None)
+    for result in results:
+        if reference is not None:
+            result["rmse_vs_reference"] = result["rmse"] - reference["rmse"]
+        if args.max_rmse is not None:
+            result["meets_target"] = result["rmse"] <= args.max_rmse
+
+    print(f"train rows: {len(X_train)}, test rows: {len(X_test)}, reference: {args.reference}")
+    print(f"{'estimator':<24}{'fit s':>8}{'1 row ms':>10}{'batch ms':>10}"
+          f"{'RMSE':>8}{'ΔRMSE':>8}{'MAE':>8}{'R2':>7}")
+    for r in results:
+        print(f"{r['estimator']:<24}{r['fit_s']:>8.2f}{r['predict_1_ms']:>10.3f}"
+              f"{r['predict_batch_ms']:>10.2f}{r['rmse']:>8.4f}"
+              f"{r.get('rmse_vs_reference', float('nan')):>+8.4f}{r['mae']:>8.4f}{r['r2']:>7.3f}")
+
+    if args.max_rmse is not None:
+        eligible = [r for r in results if r["meets_target"]]
+        if eligible:
+            fastest = min(eligible, key=lambda r: r["predict_batch_ms"])
+            print(f"fastest within RMSE {args.max_rmse}: {fastest['estimator']}")
+        else:
+            print(f"no estimator meets RMSE {args.max_rmse}")
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump({"reference": args.reference, "max_rmse": args.max_rmse,
+                       "results": results}, output, indent=2)
@@ -0,0 +1,46 @@
+# Mide el tiempo de importación en frío de los módulos del paquete y de preload().
+# Uso: python benchmarks/bench_import.py --repeat 5
+
+import argparse
+import json
+import subprocess
+import sys
+
+SNIPPET = """
+import json, time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter() - start
+start = time.perf_counter()
+{after}
+print(json.dumps({{"import": imported, "after": time.perf_counter() - start}}))
+"""
+
+CASES = {
+    "model": ("model", "pass"),
+    "model.config": ("model.config.core", "model.config.core.config.model.features"),
+    "model.predict": ("model.predict", "model.predict.preload()"),
+}
+
+
+def run_case(*, module: str, after: str) -> dict:
+    code = SNIPPET.format(module=module, after=after)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    return json.loads(output.stdout)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, (module, after) in CASES.items():
+        runs = [run_case(module=module, after=after) for _ in range(args.repeat)]
+        imported = min(run["import"] for run in runs)
+        after_import = min(run["after"] for run in runs)
+        print(
+            f"{name:15s} import: {imported * 1000:8.1f} ms"
+            f"   first use: {after_import * 1000:8.1f} ms"
+        )
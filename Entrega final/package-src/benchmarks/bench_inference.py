@@ -0,0 +1,147 @@
+# Latencia y memoria de make_prediction por etapa, para lotes de 1 a 100.000 filas.
+# Las etapas son las mismas de make_prediction: construcción del DataFrame,
+# validate_inputs (incluye drop_na_inputs, que también se mide aparte), predict
+# del modelo y armado del resultado. Los resultados se guardan en JSON para
+# comparar entre commits.
+# Uso: python benchmarks/bench_inference.py --json base.json
+#      python benchmarks/bench_inference.py --json nuevo.json --compare base.json
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+import typing as t
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from model.config.core import config
+from model.predict import get_model, make_prediction
+from model.processing.data_manager import load_dataset
+from model.processing.validation import drop_na_inputs, validate_inputs
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+# Tiempo aproximado por lote y etapa; los lotes grandes se repiten menos
+TARGET_SECONDS = 0.5
+
+
+def make_stages(records: t.List[dict]) -> t.Dict[str, t.Callable[[], t.Any]]:
+    """One callable per stage, each fed with the output of the previous one."""
+    model = get_model()
+    columnar = config.app_config.columnar_validation
+    data = pd.DataFrame(records)
+    validated, errors = validate_inputs(input_data=data, columnar=columnar)
+    assert errors is None, errors
+    features = validated[config.model.features]
+    predictions = model.predict(features)
+
+    return {
+        "dataframe": lambda: pd.DataFrame(records),
+        "validate_inputs": lambda: validate_inputs(input_data=data, columnar=columnar),
+        "drop_na_inputs": lambda: drop_na_inputs(input_data=features),
+        "predict": lambda: model.predict(features),
+        "build_result": lambda: [pred for pred in predictions],
+        "make_prediction": lambda: make_prediction(input_data=records),
+    }
+
+
+def time_stage(func: t.Callable[[], t.Any], *, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": 1000 * statistics.median(timings),
+        "min_ms": 1000 * min(timings),
+        "repeat": repeat,
+    }
+
+
+def peak_allocation(func: t.Callable[[], t.Any]) -> int:
+    """Peak bytes allocated by Python during one call."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(*, batch_sizes: t.List[int]) -> t.List[dict]:
+    sample = load_dataset(file_name=config.app_config.test_data_file)
+    sample = sample.drop(columns=[config.model.target])
+    results = []
+    for rows in batch_sizes:
+        batch = sample.sample(n=rows, replace=True, random_state=0)
+        records = batch.to_dict(orient="records")
+        for stage, func in make_stages(records).items():
+            # una llamada de calentamiento estima cuántas repeticiones caben
+            start = time.perf_counter()
+            func()
+            repeat = max(3, min(200, int(TARGET_SECONDS / (time.perf_counter() - start))))
+            result = {"stage": stage, "rows": rows, **time_stage(func, repeat=repeat)}
+            result["rows_per_s"] = rows / (result["median_ms"] / 1000)
+            result["peak_bytes"] = peak_allocation(func)
+            results.append(result)
+            print(
+                f"{rows:>7} rows  {stage:<16}{result['median_ms']:>10.3f} ms"
+                f"{result['peak_bytes'] / 2**20:>10.2f} MiB"
+            )
+    return results
+
+
+def git_commit() -> t.Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def compare(*, results: t.List[dict], baseline_file: str) -> None:
+    """Print the change in median time against a previous run."""
+    with open(baseline_file) as baseline:
+        previous = {
+            (result["stage"], result["rows"]): result for result in json.load(baseline)["results"]
+        }
+    print(f"\nchange vs {baseline_file} (median time, + is slower)")
+    for result in results:
+        before = previous.get((result["stage"], result["rows"]))
+        if before is not None:
+            change = result["median_ms"] / before["median_ms"] - 1
+            print(f"{result['rows']:>7} rows  {result['stage']:<16}{change:>+9.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=BATCH_SIZES)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="previous results to compare with")
+    args = parser.parse_args()
+
+    get_model()
+    results = run(batch_sizes=args.batch_sizes)
+
+    if args.json:
+        report = {
+            "benchmark": "inference",
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "config": {
+                "compiled_inference": config.app_config.compiled_inference,
+                "columnar_validation": config.app_config.columnar_validation,
+                "prediction_cache_size": config.app_config.prediction_cache_size,
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.compare:
+        compare(results=results, baseline_file=args.compare)
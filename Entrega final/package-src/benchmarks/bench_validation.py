@@ -0,0 +1,39 @@
+# Compara la validación por filas (pydantic) contra la validación por columnas.
+# Uso: python benchmarks/bench_validation.py --rows 50000
+
+import argparse
+import time
+
+import pandas as pd
+
+from model.config.core import config
+from model.processing.data_manager import load_dataset
+from model.processing.validation import validate_inputs
+
+
+def time_validation(*, data: pd.DataFrame, columnar: bool, repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        validate_inputs(input_data=data, columnar=columnar)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sample = load_dataset(file_name=config.app_config.test_data_file)
+    data = sample.sample(n=args.rows, replace=True, random_state=0).reset_index(drop=True)
+
+    by_row = time_validation(data=data, columnar=False, repeat=args.repeat)
+    by_column = time_validation(data=data, columnar=True, repeat=args.repeat)
+
+    print(f"rows: {args.rows}")
+    print(f"pydantic (per row): {by_row:.3f} s")
+    print(f"columnar:           {by_column:.3f} s")
+    print(f"speedup:            {by_row / by_column:.1f}x")
@@ -1,12 +1,14 @@
 import logging
+from pathlib import Path
 
-from model.config.core import PACKAGE_ROOT, config
+PACKAGE_ROOT = Path(__file__).resolve().parent
 
 # Aquí definimos un logger para el paquete, y usamos solamente el 
 # NullHandler para no restringir los logger para las aplicaciones que 
-# usen el modelo empaquetado. 
+# usen el modelo empaquetado. El logger toma el nombre del paquete
+# para no tener que leer config.yml al importar.
 # https://docs.python.org/3/howto/logging.html#configuring-logging-for-a-library
-logging.getLogger(config.app_config.package_name).addHandler(logging.NullHandler())
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 
 with open(PACKAGE_ROOT / "VERSION") as version_file:
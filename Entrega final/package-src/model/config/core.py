@@ -1,16 +1,21 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, cast
 
-from pydantic import BaseModel
-from strictyaml import YAML, load
+from pydantic import BaseModel, validator
 
 import model
+from model.estimators import validate_params
+
+if TYPE_CHECKING:
+    from strictyaml import YAML
 
 # Project Directories
 PACKAGE_ROOT = Path(model.__file__).resolve().parent
 ROOT = PACKAGE_ROOT.parent
 CONFIG_FILE_PATH = PACKAGE_ROOT / "config.yml"
 DATASET_DIR = PACKAGE_ROOT / "datasets"
+DATASET_CACHE_DIR = DATASET_DIR / "cache"
 TRAINED_MODEL_DIR = PACKAGE_ROOT / "trained"
 
 
@@ -24,6 +29,13 @@ class AppConfig(BaseModel):
     train_data_file: str
     test_data_file: str
     pipeline_save_file: str
+    dataset_cache: bool = False
+    compiled_inference: bool = False
+    columnar_validation: bool = False
+    mmap_artifact: bool = False
+    models_to_keep: int = 1
+    prediction_cache_size: int = 0
+    prediction_cache_ttl: float = 0
 
 
 class ModelConfig(BaseModel):
@@ -36,14 +48,30 @@ class ModelConfig(BaseModel):
     features: List[str]
     test_size: float
     random_state: int
-    n_estimators: int
-    learning_rate: float
-    max_depth: int
+    estimator: str = "gradient_boosting"
+    estimator_params: Dict[str, Dict[str, Any]] = {}
+    incremental_max_stages: int = 50
+    incremental_holdout: float = 0.2
     temp_features: List[str]
     qual_vars: List[str]
     categorical_vars: Sequence[str]
     qual_mappings: Dict[str, int]
 
+    @validator("estimator")
+    def estimator_is_registered(cls, value: str) -> str:
+        validate_params(name=value)
+        return value
+
+    @validator("estimator_params")
+    def params_match_estimator(
+        cls, value: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        # strictyaml entrega texto: cada bloque se valida con el esquema de su estimador
+        return {
+            name: validate_params(name=name, params=params).dict()
+            for name, params in value.items()
+        }
+
 
 class Config(BaseModel):
     """Master config object."""
@@ -59,8 +87,9 @@ def find_config_file() -> Path:
     raise Exception(f"Config not found at {CONFIG_FILE_PATH!r}")
 
 
-def fetch_config_from_yaml(cfg_path: Optional[Path] = None) -> YAML:
+def fetch_config_from_yaml(cfg_path: Optional[Path] = None) -> "YAML":
     """Parse YAML containing the package configuration."""
+    from strictyaml import load
 
     if not cfg_path:
         cfg_path = find_config_file()
@@ -72,7 +101,7 @@ def fetch_config_from_yaml(cfg_path: Optional[Path] = None) -> YAML:
     raise OSError(f"Did not find config file at path: {cfg_path}")
 
 
-def create_and_validate_config(parsed_config: YAML = None) -> Config:
+def create_and_validate_config(parsed_config: "YAML" = None) -> Config:
     """Run validation on config values."""
     if parsed_config is None:
         parsed_config = fetch_config_from_yaml()
@@ -86,4 +115,17 @@ def create_and_validate_config(parsed_config: YAML = None) -> Config:
     return _config
 
 
-config = create_and_validate_config()
+@lru_cache(maxsize=None)
+def get_config() -> Config:
+    """Parse and validate config.yml once, the first time it is needed."""
+    return create_and_validate_config()
+
+
+class LazyConfig:
+    """Stand-in for the Config object that parses config.yml on first use."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_config(), name)
+
+
+config = cast(Config, LazyConfig())
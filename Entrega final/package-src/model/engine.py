@@ -0,0 +1,300 @@
+import json
+import mmap
+import os
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+if t.TYPE_CHECKING:
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.pipeline import Pipeline
+
+# Rows scored per traversal pass, keeps the (rows x trees) node matrix small.
+CHUNK_SIZE = 2048
+
+# Above this batch size sklearn's compiled per-tree loop is faster than
+# NumPy traversal, so the batch is handed back to the fitted estimator.
+VECTORIZED_MAX_ROWS = 32
+
+# Node arrays stored in a trees artifact, and their on-disk dtypes.
+TREE_ARRAYS = {
+    "roots": "<i8",
+    "children_left": "<i8",
+    "feature": "<i8",
+    "threshold": "<f8",
+    "value": "<f8",
+}
+TREES_FORMAT = 1
+ALIGNMENT = 64
+
+
+def _flatten_tree(tree: t.Any, offset: int) -> t.Tuple[np.ndarray, ...]:
+    """
+    Renumber the nodes of a fitted tree breadth first so that
+    the right child always follows the left one. Traversal
+    is then just `node = left[node] + (x > threshold[node])`.
+    """
+    order = [0]
+    for node in order:
+        if tree.children_left[node] != -1:
+            order.extend((tree.children_left[node], tree.children_right[node]))
+
+    position = np.empty(tree.node_count, dtype=np.intp)
+    position[order] = np.arange(len(order)) + offset
+    order = np.asarray(order)
+
+    is_leaf = tree.children_left[order] == -1
+    # Leaves point to themselves and never go right,
+    # so extra traversal steps are no-ops.
+    left = np.where(is_leaf, position[order], position[tree.children_left[order]])
+    feature = np.where(is_leaf, 0, tree.feature[order])
+    threshold = np.where(is_leaf, np.inf, tree.threshold[order])
+    value = tree.value[order, 0, 0]
+    return left, feature, threshold, value
+
+
+class CompiledEnsemble:
+    """
+    Array-based copy of a fitted GradientBoostingRegressor.
+    All the trees are flattened once into contiguous node arrays,
+    so small batches skip sklearn's per-call input checks and
+    are scored with vectorized traversal. The arrays can also come
+    from a memory-mapped trees artifact, with no estimator at all.
+    """
+
+    def __init__(
+        self,
+        *,
+        roots: np.ndarray,
+        children_left: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        value: np.ndarray,
+        base_score: float,
+        max_depth: int,
+        n_features_in_: int,
+        feature_names_in_: t.Optional[t.Sequence[str]] = None,
+        estimator: t.Optional["GradientBoostingRegressor"] = None,
+    ):
+        self.roots = roots
+        self.children_left = children_left
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.base_score = base_score
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features_in_
+        self.feature_names_in_ = feature_names_in_
+        self.estimator = estimator
+
+    @classmethod
+    def from_estimator(cls, estimator: "GradientBoostingRegressor") -> "CompiledEnsemble":
+        from sklearn.dummy import DummyRegressor
+        from sklearn.ensemble import GradientBoostingRegressor
+
+        if not isinstance(estimator, GradientBoostingRegressor):
+            raise TypeError(
+                f"Cannot compile estimator of type {type(estimator).__name__}"
+            )
+
+        if isinstance(estimator.init_, str) and estimator.init_ == "zero":
+            base_score = 0.0
+        elif isinstance(estimator.init_, DummyRegressor):
+            base_score = float(np.ravel(estimator.init_.constant_)[0])
+        else:
+            raise TypeError(
+                f"Cannot compile init estimator {type(estimator.init_).__name__}"
+            )
+
+        trees = [stage[0].tree_ for stage in estimator.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+        left, feature, threshold, value = zip(
+            *(_flatten_tree(tree, offset) for tree, offset in zip(trees, offsets))
+        )
+
+        feature_names = getattr(estimator, "feature_names_in_", None)
+        return cls(
+            roots=np.asarray(offsets, dtype=np.intp),
+            children_left=np.ascontiguousarray(np.concatenate(left), dtype=np.intp),
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(threshold)),
+            value=np.ascontiguousarray(np.concatenate(value) * estimator.learning_rate),
+            base_score=base_score,
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features_in_=estimator.n_features_in_,
+            feature_names_in_=None if feature_names is None else list(feature_names),
+            estimator=estimator,
+        )
+
+    def _to_array(self, X: t.Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is not None:
+            if list(X.columns) != list(self.feature_names_in_):
+                X = X[list(self.feature_names_in_)]
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has shape {X.shape}, expected {self.n_features_in_} features"
+            )
+        if np.isnan(X).any():
+            raise ValueError("Input X contains NaN.")
+        return X
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[:, np.newaxis]
+
+        nodes = np.broadcast_to(self.roots, (n_rows, self.roots.shape[0]))
+        for _ in range(self.max_depth):
+            values = flat[row_offsets + self.feature[nodes]]
+            nodes = self.children_left[nodes] + (values > self.threshold[nodes])
+
+        # Accumulate stage by stage, in the same order as sklearn does.
+        stages = np.empty((n_rows, nodes.shape[1] + 1))
+        stages[:, 0] = self.base_score
+        stages[:, 1:] = self.value[nodes]
+        return np.cumsum(stages, axis=1)[:, -1]
+
+    def predict_vectorized(self, X: t.Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        X = self._to_array(X)
+        if X.shape[0] <= CHUNK_SIZE:
+            return self._predict_chunk(X)
+        return np.concatenate(
+            [
+                self._predict_chunk(X[start : start + CHUNK_SIZE])
+                for start in range(0, X.shape[0], CHUNK_SIZE)
+            ]
+        )
+
+    def predict(self, X: t.Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        if self.estimator is not None and len(X) > VECTORIZED_MAX_ROWS:
+            return self.estimator.predict(X)
+        return self.predict_vectorized(X)
+
+
+class CompiledPipeline:
+    """
+    Drop-in replacement for a fitted pipeline at inference time.
+    Any preceding steps are applied as usual and the final
+    gradient boosting step is scored with a CompiledEnsemble.
+    """
+
+    def __init__(self, *, ensemble: CompiledEnsemble, transformers: t.Sequence = ()):
+        self.ensemble = ensemble
+        self.transformers = list(transformers)
+
+    def predict(self, X: t.Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        for transformer in self.transformers:
+            X = transformer.transform(X)
+        return self.ensemble.predict(X)
+
+
+def is_compilable(pipeline: "Pipeline") -> bool:
+    """Whether the final step is a single-output GradientBoostingRegressor."""
+    from sklearn.dummy import DummyRegressor
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    estimator = pipeline.steps[-1][1]
+    return isinstance(estimator, GradientBoostingRegressor) and (
+        isinstance(estimator.init_, DummyRegressor) or estimator.init_ == "zero"
+    )
+
+
+def compile_pipeline(pipeline: "Pipeline") -> CompiledPipeline:
+    """Flatten the trees of a fitted pipeline for fast inference."""
+    return CompiledPipeline(
+        ensemble=CompiledEnsemble.from_estimator(pipeline.steps[-1][1]),
+        transformers=[step for _, step in pipeline.steps[:-1]],
+    )
+
+
+def save_trees(*, ensemble: CompiledEnsemble, file_path: Path, version: str) -> None:
+    """
+    Write the node arrays of an ensemble as one flat binary file:
+    an 8-byte header length, a JSON header, then every array
+    aligned to 64 bytes so it can be mapped straight into memory.
+    The file is written next to its destination and renamed into
+    place, so readers never see a partial artifact.
+    """
+
+    arrays = {
+        name: np.ascontiguousarray(getattr(ensemble, name), dtype=dtype)
+        for name, dtype in TREE_ARRAYS.items()
+    }
+    header = {
+        "format": TREES_FORMAT,
+        "version": version,
+        "base_score": ensemble.base_score,
+        "max_depth": ensemble.max_depth,
+        "n_features_in": ensemble.n_features_in_,
+        "feature_names_in": ensemble.feature_names_in_,
+        "arrays": {},
+    }
+
+    # Array offsets are relative to the data section, which starts
+    # at the first aligned position after the header
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": TREE_ARRAYS[name],
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _align(offset + array.nbytes)
+    encoded = json.dumps(header).encode()
+    data_start = _align(8 + len(encoded))
+
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as artifact:
+        artifact.write(len(encoded).to_bytes(8, "little"))
+        artifact.write(encoded)
+        for name, array in arrays.items():
+            artifact.seek(data_start + header["arrays"][name]["offset"])
+            artifact.write(array.tobytes())
+        artifact.truncate(data_start + offset)
+    os.replace(tmp_path, file_path)
+
+
+def load_trees(*, file_path: Path, version: t.Optional[str] = None) -> CompiledPipeline:
+    """
+    Map a trees artifact read-only. The arrays are views on the
+    mapping, so every process that loads the same file shares
+    the same physical pages.
+    """
+
+    with open(file_path, "rb") as artifact:
+        buffer = mmap.mmap(artifact.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header_size = int.from_bytes(buffer[:8], "little")
+    header = json.loads(buffer[8 : 8 + header_size])
+    data_start = _align(8 + header_size)
+    if header["format"] != TREES_FORMAT:
+        raise ValueError(f"Unsupported trees artifact format {header['format']!r}")
+    if version is not None and header["version"] != version:
+        raise ValueError(
+            f"Trees artifact is for model version {header['version']}, not {version}"
+        )
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        offset = data_start + spec["offset"]
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        arrays[name] = array.reshape(spec["shape"])
+
+    ensemble = CompiledEnsemble(
+        **arrays,
+        base_score=header["base_score"],
+        max_depth=header["max_depth"],
+        n_features_in_=header["n_features_in"],
+        feature_names_in_=header["feature_names_in"],
+    )
+    return CompiledPipeline(ensemble=ensemble)
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -0,0 +1,103 @@
+import typing as t
+
+from pydantic import BaseModel
+
+# Registro de estimadores: config.yml elige uno por nombre (`estimator`) y
+# sus hiperparámetros salen del bloque con ese nombre en `estimator_params`.
+# Las librerías de cada estimador se importan solo al construirlo.
+
+
+class EstimatorParams(BaseModel):
+    """Hyperparameters of a backend; unknown or misspelled keys are an error."""
+
+    class Config:
+        extra = "forbid"
+
+
+class GradientBoostingParams(EstimatorParams):
+    n_estimators: int = 100
+    learning_rate: float = 0.1
+    max_depth: int = 3
+    subsample: float = 1.0
+
+
+class HistGradientBoostingParams(EstimatorParams):
+    max_iter: int = 100
+    learning_rate: float = 0.1
+    max_leaf_nodes: int = 31
+    max_depth: t.Optional[int] = None
+    l2_regularization: float = 0.0
+
+
+class RandomForestParams(EstimatorParams):
+    n_estimators: int = 100
+    max_depth: t.Optional[int] = None
+    min_samples_split: int = 2
+    n_jobs: t.Optional[int] = None
+
+
+class XGBoostParams(EstimatorParams):
+    n_estimators: int = 100
+    learning_rate: float = 0.3
+    max_depth: int = 6
+    n_jobs: t.Optional[int] = None
+
+
+class EstimatorBackend(t.NamedTuple):
+    params: t.Type[EstimatorParams]
+    build: t.Callable[[EstimatorParams, int], t.Any]
+
+
+ESTIMATORS: t.Dict[str, EstimatorBackend] = {}
+
+
+def register_estimator(
+    name: str, *, params: t.Type[EstimatorParams]
+) -> t.Callable[[t.Callable], t.Callable]:
+    """Register a function that builds an unfitted estimator from its params."""
+
+    def decorator(build: t.Callable) -> t.Callable:
+        ESTIMATORS[name] = EstimatorBackend(params=params, build=build)
+        return build
+
+    return decorator
+
+
+def validate_params(*, name: str, params: t.Optional[dict] = None) -> EstimatorParams:
+    """Hyperparameters of a backend, parsed and completed with defaults."""
+    if name not in ESTIMATORS:
+        raise ValueError(f"Unknown estimator {name!r}, expected one of {sorted(ESTIMATORS)}")
+    return ESTIMATORS[name].params(**(params or {}))
+
+
+def build_estimator(*, name: str, params: t.Optional[dict] = None, random_state: int = 0):
+    """Unfitted estimator of a registered backend."""
+    return ESTIMATORS[name].build(validate_params(name=name, params=params), random_state)
+
+
+@register_estimator("gradient_boosting", params=GradientBoostingParams)
+def _gradient_boosting(params: GradientBoostingParams, random_state: int):
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    return GradientBoostingRegressor(**params.dict(), random_state=random_state)
+
+
+@register_estimator("hist_gradient_boosting", params=HistGradientBoostingParams)
+def _hist_gradient_boosting(params: HistGradientBoostingParams, random_state: int):
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    return HistGradientBoostingRegressor(**params.dict(), random_state=random_state)
+
+
+@register_estimator("random_forest", params=RandomForestParams)
+def _random_forest(params: RandomForestParams, random_state: int):
+    from sklearn.ensemble import RandomForestRegressor
+
+    return RandomForestRegressor(**params.dict(), random_state=random_state)
+
+
+@register_estimator("xgboost", params=XGBoostParams)
+def _xgboost(params: XGBoostParams, random_state: int):
+    from xgboost import XGBRegressor
+
+    return XGBRegressor(**params.dict(), random_state=random_state, verbosity=0)
@@ -0,0 +1,221 @@
+import threading
+import time
+import typing as t
+from bisect import bisect_left
+
+# Métricas de inferencia en memoria con salida en formato de texto de Prometheus.
+# Están desactivadas por defecto: timed() devuelve entonces un context manager
+# vacío compartido y observe()/inc() no hacen nada, así el costo es una
+# verificación de un booleano por etapa.
+
+_enabled = False
+
+
+def enable(flag: bool = True) -> None:
+    """Turn the collection of metrics on or off for this process."""
+    global _enabled
+    _enabled = flag
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _format_labels(names: t.Sequence[str], values: t.Sequence[str], **extra: str) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, *, labels: t.Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: t.Dict[t.Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        if not _enabled:
+            return
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> t.List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram:
+    """Bucketed distribution of observations per combination of label values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        *,
+        buckets: t.Sequence[float],
+        labels: t.Sequence[str] = (),
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = sorted(buckets)
+        # por etiqueta: conteo por bucket (el último es +Inf) y suma
+        self._series: t.Dict[t.Tuple[str, ...], t.Tuple[t.List[int], t.List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        if not _enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def samples(self) -> t.List[str]:
+        with self._lock:
+            series = sorted(
+                (key, (list(counts), total[0])) for key, (counts, total) in self._series.items()
+            )
+        lines = []
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + [float("inf")], counts):
+                cumulative += count
+                labels = _format_labels(self.labels, key, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: t.Dict[str, t.Union[Counter, Histogram]] = {}
+
+    def register(self, metric: t.Any) -> t.Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# De 100 µs a 10 s: las etapas de una fila toman fracciones de milisegundo
+SECONDS_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+ROWS_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000)
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "house_pricing_stage_seconds",
+        "Time spent in each stage of a prediction.",
+        buckets=SECONDS_BUCKETS,
+        labels=("stage",),
+    )
+)
+BATCH_ROWS = REGISTRY.register(
+    Histogram(
+        "house_pricing_batch_rows",
+        "Rows per prediction call.",
+        buckets=ROWS_BUCKETS,
+    )
+)
+PREDICTION_ERRORS = REGISTRY.register(
+    Counter(
+        "house_pricing_prediction_errors_total",
+        "Prediction calls rejected by input validation.",
+        labels=("stage",),
+    )
+)
+
+
+class _StageTimer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> "_StageTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, self.stage)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timed(stage: str) -> t.Union[_StageTimer, _NullTimer]:
+    """Context manager that records the time of a block under `stage`."""
+    return _StageTimer(stage) if _enabled else _NULL_TIMER
@@ -1,19 +1,18 @@
 from sklearn.pipeline import Pipeline
-from sklearn.ensemble import GradientBoostingRegressor
 
 from model.config.core import config
+from model.estimators import build_estimator
 from model.processing import features as pp
 
 housing_pipe = Pipeline(
     steps=[
         (
-            "gradient_boosting_model",
-            GradientBoostingRegressor(
-                n_estimators=config.model.n_estimators,
-                learning_rate=config.model.learning_rate,
-                max_depth=config.model.max_depth,
+            f"{config.model.estimator}_model",
+            build_estimator(
+                name=config.model.estimator,
+                params=config.model.estimator_params.get(config.model.estimator),
                 random_state=config.model.random_state,
             ),
         ),
     ]
-)
\ No newline at end of file
+)
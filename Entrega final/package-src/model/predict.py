@@ -1,35 +1,207 @@
+import threading
 import typing as t
+from collections import OrderedDict
 
 import numpy as np
 import pandas as pd
 
 from model import __version__ as _version
+from model import metrics
+from model.cache import PredictionCache
 from model.config.core import config
-from model.processing.data_manager import load_pipeline
+from model.processing.data_manager import (
+    list_versions,
+    load_mmap_pipeline,
+    load_pipeline,
+    model_file_name,
+)
 from model.processing.validation import validate_inputs
 
-pipeline_file_name = f"{config.app_config.pipeline_save_file}{_version}.pkl"
-_housing_pipe = load_pipeline(file_name=pipeline_file_name)
+
+class ActiveModel(t.NamedTuple):
+    """A loaded model version, with its own prediction cache."""
+
+    version: str
+    pipeline: t.Any
+    cache: t.Optional[PredictionCache]
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        if self.cache is None:
+            return self.pipeline.predict(X=X)
+        return self.cache.predict(model=self.pipeline, X=X)
+
+
+# The model is loaded on first use, or up front through preload().
+# Swapping versions replaces the whole tuple, so a request that already
+# read it keeps scoring with the same pipeline until it finishes.
+_active: t.Optional[ActiveModel] = None
+_load_lock = threading.RLock()
+
+# Recently used versions, so a request submitted before a swap (or scored
+# in a worker process) finds its version without reloading it or
+# changing the active model.
+LOADED_VERSIONS = 2
+_loaded: "OrderedDict[str, ActiveModel]" = OrderedDict()
+
+
+def load_model(*, version: str) -> ActiveModel:
+    """Load a model version from the store."""
+
+    cache = None
+    if config.app_config.prediction_cache_size > 0:
+        # Opt-in cache of predictions, disabled when prediction_cache_size is 0
+        cache = PredictionCache(
+            max_size=config.app_config.prediction_cache_size,
+            ttl=config.app_config.prediction_cache_ttl,
+            version=version,
+        )
+    if config.app_config.mmap_artifact:
+        pipeline = load_mmap_pipeline(
+            file_name=model_file_name(version=version, suffix=".trees"),
+            pipeline_file_name=model_file_name(version=version),
+            version=version,
+        )
+    else:
+        pipeline = load_pipeline(
+            file_name=model_file_name(version=version),
+            compiled=config.app_config.compiled_inference,
+        )
+    return ActiveModel(version=version, pipeline=pipeline, cache=cache)
+
+
+def _loaded_model(version: str) -> ActiveModel:
+    """Return a loaded version, loading it if needed. Must hold _load_lock."""
+
+    model = _loaded.get(version)
+    if model is None:
+        if version not in list_versions():
+            raise ValueError(f"Model version {version} not found")
+        model = load_model(version=version)
+        _loaded[version] = model
+    _loaded.move_to_end(version)
+    while len(_loaded) > LOADED_VERSIONS:
+        _loaded.popitem(last=False)
+    return model
+
+
+def get_model(version: t.Optional[str] = None) -> ActiveModel:
+    """
+    Return the active model, loading the package version the first
+    time. Asking for another version returns that version, loaded
+    if needed, without making it the active one.
+    """
+
+    model = _active
+    if version is None:
+        if model is None:
+            with _load_lock:
+                if _active is None:
+                    activate(version=_version)
+                model = _active
+        return model
+    if model is not None and model.version == version:
+        return model
+    with _load_lock:
+        return _loaded_model(version)
+
+
+def activate(*, version: str) -> ActiveModel:
+    """
+    Load a version and make it the active model in one step.
+    Requests in flight finish on the model they started with.
+    """
+    global _active
+
+    with _load_lock:
+        if _active is None or _active.version != version:
+            _active = _loaded_model(version)
+        return _active
+
+
+def active_version() -> str:
+    return get_model().version
+
+
+def get_pipeline() -> t.Any:
+    """Return the pipeline of the active model, loading it the first time."""
+    return get_model().pipeline
+
+
+def preload() -> None:
+    """Load the pipeline now instead of on the first prediction."""
+    get_model()
 
 
 def make_prediction(
     *,
     input_data: t.Union[pd.DataFrame, dict],
+    version: t.Optional[str] = None,
 ) -> dict:
-    """Make a prediction using a saved model pipeline."""
+    """Make a prediction using a saved model pipeline.
+    By default the active model is used; passing a version
+    scores with that version without activating it. The result
+    reports the version that actually scored the inputs.
+    """
 
-    data = pd.DataFrame(input_data)
-    validated_data, errors = validate_inputs(input_data=data)
-    results = {"predictions": None, "version": _version, "errors": errors}
-
-    if not errors:
-        predictions = _housing_pipe.predict(
-            X=validated_data[config.model.features]
+    model = get_model(version)
+    with metrics.timed("dataframe"):
+        data = pd.DataFrame(input_data)
+    metrics.BATCH_ROWS.observe(len(data))
+    with metrics.timed("validate_inputs"):
+        validated_data, errors = validate_inputs(
+            input_data=data, columnar=config.app_config.columnar_validation
         )
+    results = {"predictions": None, "version": model.version, "errors": errors}
+
+    if errors:
+        metrics.PREDICTION_ERRORS.inc("validate_inputs")
+    else:
+        with metrics.timed("predict"):
+            predictions = model.predict(validated_data[config.model.features])
         results = {
-            "predictions": [pred for pred in predictions], 
-            "version": _version,
+            "predictions": np.asarray(predictions).tolist(),
+            "version": model.version,
             "errors": errors,
         }
 
     return results
+
+
+def make_predictions(
+    *,
+    inputs: t.Sequence[t.Union[pd.DataFrame, dict]],
+    version: t.Optional[str] = None,
+) -> t.List[dict]:
+    """
+    Score several independent inputs in one pass over the pipeline.
+    Returns one result per input, the same as calling make_prediction
+    on each of them.
+    """
+
+    model = get_model(version)
+    with metrics.timed("dataframe"):
+        frames = [pd.DataFrame(input_data) for input_data in inputs]
+        data = pd.concat(frames, keys=range(len(frames)))
+    metrics.BATCH_ROWS.observe(len(data))
+    with metrics.timed("validate_inputs"):
+        validated_data, errors = validate_inputs(
+            input_data=data, columnar=config.app_config.columnar_validation
+        )
+
+    if errors:
+        # error locations refer to the combined batch, score each input on its own
+        return [
+            make_prediction(input_data=frame, version=model.version) for frame in frames
+        ]
+
+    if validated_data.empty:
+        predictions = np.empty(0)
+    else:
+        with metrics.timed("predict"):
+            predictions = model.predict(validated_data[config.model.features])
+    owners = validated_data.index.get_level_values(0)
+    counts = np.bincount(owners, minlength=len(frames))
+    return [
+        {"predictions": split.tolist(), "version": model.version, "errors": None}
+        for split in np.split(predictions, np.cumsum(counts)[:-1])
+    ]
@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from model.config.core import config
+
+CITY = "city"
+CITY_PREFIX = "city_"
+
+
+@lru_cache(maxsize=None)
+def city_index() -> Tuple[List[str], Dict[str, int]]:
+    """
+    One-hot city columns in the model's feature order, e.g.
+    city_Beaux_Arts_Village, and the code of every city name.
+    A city can be sent by name ("Beaux Arts Village" or
+    "Beaux_Arts_Village") or by its integer code, which is
+    its position among the city columns.
+    """
+    columns = [var for var in config.model.features if var.startswith(CITY_PREFIX)]
+    codes: Dict[str, int] = {}
+    for code, column in enumerate(columns):
+        name = column[len(CITY_PREFIX) :]
+        codes[name] = code
+        codes[name.replace("_", " ")] = code
+    return columns, codes
+
+
+def _is_code(city: object) -> bool:
+    return isinstance(city, (int, np.integer)) and not isinstance(city, (bool, np.bool_))
+
+
+def encode_city(*, input_data: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[List[dict]]]:
+    """
+    Expand a compact `city` column (name or integer code) into the
+    model's one-hot city columns. Rows without a city keep whatever
+    city_* values they were sent with. Error rows are positions in
+    input_data.
+    """
+
+    city_columns, city_codes = city_index()
+    if CITY not in input_data.columns:
+        return input_data, None
+
+    cities = input_data[CITY]
+    given = cities.notna().to_numpy()
+    if not given.any():
+        return input_data.drop(columns=CITY), None
+
+    if pd.api.types.is_numeric_dtype(cities) and not pd.api.types.is_bool_dtype(cities):
+        codes = cities.to_numpy(dtype=float)
+    else:
+        codes = cities.map(city_codes).to_numpy(dtype=float)
+        # a payload can mix names and integer codes in the same column
+        is_code = np.array([_is_code(city) for city in cities], dtype=bool)
+        if is_code.any():
+            codes[is_code] = cities[is_code].to_numpy(dtype=float)
+    known = given & np.isin(codes, np.arange(len(city_columns)))
+
+    unknown = given & ~known
+    errors = [
+        {"loc": ["inputs", row, CITY], "msg": "unknown city", "type": "value_error.city"}
+        for row in np.flatnonzero(unknown).tolist()
+    ]
+
+    one_hot = np.zeros((len(input_data), len(city_columns)), dtype=bool)
+    rows = np.flatnonzero(known)
+    one_hot[rows, codes[rows].astype(np.intp)] = True
+    encoded = pd.DataFrame(one_hot, columns=city_columns, index=input_data.index)
+
+    if not given.all():
+        sent = input_data.reindex(columns=city_columns)
+        encoded = encoded.where(np.broadcast_to(given[:, np.newaxis], encoded.shape), sent)
+
+    other_columns = input_data.columns.difference([CITY] + city_columns, sort=False)
+    expanded = pd.concat([input_data[other_columns], encoded], axis=1)
+    return expanded, errors or None
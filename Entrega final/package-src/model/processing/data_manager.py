@@ -1,12 +1,22 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
 import typing as t
 from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.pipeline import Pipeline
 
 from model import __version__ as _version
-from model.config.core import DATASET_DIR, TRAINED_MODEL_DIR, config
+from model.config.core import DATASET_CACHE_DIR, DATASET_DIR, TRAINED_MODEL_DIR, config
+
+if t.TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+    from model.engine import CompiledPipeline
 
 
 def load_dataset(*, file_name: str) -> pd.DataFrame:
@@ -18,36 +28,220 @@ def load_dataset(*, file_name: str) -> pd.DataFrame:
     #return transformed
 
 
-def save_pipeline(*, pipeline_to_persist: Pipeline) -> None:
+def load_training_data(*, file_name: str) -> t.Tuple[pd.DataFrame, pd.Series]:
+    """
+    Features and target of a dataset. With dataset_cache enabled
+    they are read from .npy files built on the first call, which
+    skips parsing the CSV on every training run.
+    """
+
+    features, target = config.model.features, config.model.target
+    if not config.app_config.dataset_cache:
+        data = load_dataset(file_name=file_name)
+        return data[features], data[target]
+
+    cache_path = DATASET_CACHE_DIR / dataset_key(file_name=file_name)
+    if not cache_path.is_dir():
+        data = load_dataset(file_name=file_name)
+        build_dataset_cache(
+            cache_path=cache_path,
+            X=data[features].to_numpy(dtype=np.float64),
+            y=data[target].to_numpy(dtype=np.float64),
+        )
+
+    X = np.load(cache_path / "X.npy")
+    y = np.load(cache_path / "y.npy")
+    return pd.DataFrame(X, columns=features), pd.Series(y, name=target)
+
+
+def dataset_key(*, file_name: str) -> str:
+    """
+    Cache entry of a dataset: a hash of the raw file content and of the
+    config that shapes the arrays, so changing either one misses the cache.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(DATASET_DIR / file_name, "rb") as raw_file:
+        for block in iter(lambda: raw_file.read(1 << 20), b""):
+            digest.update(block)
+    preprocessing = {"features": config.model.features, "target": config.model.target}
+    digest.update(json.dumps(preprocessing, sort_keys=True).encode())
+    return f"{Path(file_name).stem}-{digest.hexdigest()}"
+
+
+def build_dataset_cache(*, cache_path: Path, X: np.ndarray, y: np.ndarray) -> None:
+    """
+    Write a cache entry atomically and drop the older entries of the
+    same dataset.
+    """
+
+    stem = cache_path.name.rsplit("-", 1)[0]
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    building = Path(tempfile.mkdtemp(dir=cache_path.parent, prefix=".building-"))
+    try:
+        np.save(building / "X.npy", X)
+        np.save(building / "y.npy", y)
+        os.replace(building, cache_path)
+    except OSError:
+        # otro proceso ya la construyó, o no se puede escribir
+        shutil.rmtree(building, ignore_errors=True)
+        if not cache_path.is_dir():
+            raise
+
+    for entry in cache_path.parent.glob(f"{stem}-*"):
+        if entry != cache_path and entry.name.rsplit("-", 1)[0] == stem:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def save_pipeline(
+    *,
+    pipeline_to_persist: "Pipeline",
+    version: str = _version,
+    lineage: t.Optional[dict] = None,
+) -> None:
     """Persist the pipeline.
-    Saves the versioned model, and overwrites any previous
-    saved models. This ensures that when the package is
-    published, there is only one trained model that can be
-    called, and we know exactly how it was built.
+    Saves the versioned model and removes the older ones,
+    keeping only the `models_to_keep` most recent versions
+    so the API can switch between them at runtime. The
+    lineage, if given, is written next to it as JSON;
+    otherwise any earlier lineage of the version is removed.
     """
 
+    from model.engine import is_compilable
+
     # Prepare versioned save file name
-    save_file_name = f"{config.app_config.pipeline_save_file}{_version}.pkl"
-    save_path = TRAINED_MODEL_DIR / save_file_name
+    save_path = TRAINED_MODEL_DIR / model_file_name(version=version)
 
-    remove_old_pipelines(files_to_keep=[save_file_name])
     joblib.dump(pipeline_to_persist, save_path)
+    lineage_path = TRAINED_MODEL_DIR / model_file_name(version=version, suffix=".json")
+    if lineage is not None:
+        lineage_path.write_text(json.dumps(lineage, indent=2))
+    else:
+        # lineage of an earlier model saved with this version no longer applies
+        lineage_path.unlink(missing_ok=True)
+    trees_file_name = model_file_name(version=version, suffix=".trees")
+    if config.app_config.mmap_artifact and is_compilable(pipeline_to_persist):
+        save_trees_artifact(
+            pipeline_to_persist=pipeline_to_persist,
+            file_name=trees_file_name,
+            version=version,
+        )
+    else:
+        # trees of an earlier model saved with this version would be served
+        # instead of the new pipeline; load_mmap_pipeline rebuilds them if needed
+        (TRAINED_MODEL_DIR / trees_file_name).unlink(missing_ok=True)
+
+    versions_to_keep = list_versions()[-config.app_config.models_to_keep:]
+    if version not in versions_to_keep:
+        versions_to_keep.append(version)
+    remove_old_pipelines(
+        files_to_keep=[
+            model_file_name(version=kept, suffix=suffix)
+            for kept in versions_to_keep
+            for suffix in (".pkl", ".trees", ".json")
+        ]
+    )
 
 
-def load_pipeline(*, file_name: str) -> Pipeline:
-    """Load a persisted pipeline."""
+def load_lineage(*, version: str = _version) -> t.Optional[dict]:
+    """Lineage saved with a model version, if any."""
+    lineage_path = TRAINED_MODEL_DIR / model_file_name(version=version, suffix=".json")
+    if not lineage_path.is_file():
+        return None
+    return json.loads(lineage_path.read_text())
+
+
+def model_file_name(*, version: str = _version, suffix: str = ".pkl") -> str:
+    """Name of the file that stores a given model version."""
+    return f"{config.app_config.pipeline_save_file}{version}{suffix}"
+
+
+def list_versions() -> t.List[str]:
+    """Model versions available in the store, oldest first."""
+    prefix = config.app_config.pipeline_save_file
+    versions = [
+        model_file.name[len(prefix):-len(".pkl")]
+        for model_file in TRAINED_MODEL_DIR.glob(f"{prefix}*.pkl")
+    ]
+    return sorted(versions, key=_version_key)
+
+
+def _version_key(version: str) -> t.Tuple[t.Tuple[int, t.Union[int, str]], ...]:
+    # "0.0.10" va después de "0.0.9"
+    return tuple(
+        (0, int(part)) if part.isdigit() else (1, part) for part in version.split(".")
+    )
+
+
+def load_pipeline(
+    *, file_name: str, compiled: bool = False
+) -> t.Union["Pipeline", "CompiledPipeline"]:
+    """Load a persisted pipeline.
+    With compiled=True the trees are flattened once into
+    NumPy arrays and scored with the vectorized engine.
+    Estimators the engine cannot compile are returned as is.
+    """
 
     file_path = TRAINED_MODEL_DIR / file_name
     trained_model = joblib.load(filename=file_path)
+    if compiled:
+        from model.engine import compile_pipeline, is_compilable
+
+        if is_compilable(trained_model):
+            return compile_pipeline(trained_model)
     return trained_model
 
 
+def save_trees_artifact(
+    *, pipeline_to_persist: "Pipeline", file_name: str, version: str = _version
+) -> None:
+    """
+    Save the trees of a fitted pipeline as a memory-mappable
+    artifact. Only pipelines made of the boosting step alone
+    can be stored this way.
+    """
+    from model.engine import compile_pipeline, is_compilable, save_trees
+
+    if len(pipeline_to_persist.steps) != 1 or not is_compilable(pipeline_to_persist):
+        raise ValueError("Only a single gradient boosting step can be saved as trees")
+
+    compiled = compile_pipeline(pipeline_to_persist)
+    save_trees(
+        ensemble=compiled.ensemble,
+        file_path=TRAINED_MODEL_DIR / file_name,
+        version=version,
+    )
+
+
+def load_mmap_pipeline(
+    *, file_name: str, pipeline_file_name: str, version: str = _version
+) -> "CompiledPipeline":
+    """
+    Map a trees artifact read-only, so that every worker process
+    on the host shares one copy of the model. If the artifact is
+    missing it is built once from the pickled pipeline. Pipelines
+    that cannot be stored as trees are loaded as usual.
+    """
+    from model.engine import load_trees
+
+    file_path = TRAINED_MODEL_DIR / file_name
+    if not file_path.is_file():
+        pipeline = load_pipeline(file_name=pipeline_file_name)
+        try:
+            save_trees_artifact(
+                pipeline_to_persist=pipeline, file_name=file_name, version=version
+            )
+        except (OSError, ValueError):
+            # read-only install or another estimator: private in-memory copy instead
+            return load_pipeline(file_name=pipeline_file_name, compiled=True)
+    return load_trees(file_path=file_path, version=version)
+
+
 def remove_old_pipelines(*, files_to_keep: t.List[str]) -> None:
     """
     Remove old model pipelines.
-    This is to ensure there is a simple one-to-one
-    mapping between the package version and the model
-    version to be imported and used by other applications.
+    Every file in the store that is not listed is deleted,
+    so each version kept is one that can still be served.
     """
     do_not_delete = files_to_keep + ["__init__.py"]
     for model_file in TRAINED_MODEL_DIR.iterdir():
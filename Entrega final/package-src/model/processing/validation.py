@@ -1,10 +1,15 @@
-from typing import List, Optional, Tuple
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_type_hints
 
 import numpy as np
 import pandas as pd
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, StrictInt, ValidationError, validator
+from pydantic.errors import IntegerError
+from pydantic.fields import ModelField
 
 from model.config.core import config
+from model.processing.cities import encode_city
 
 
 def drop_na_inputs(*, input_data: pd.DataFrame) -> pd.DataFrame:
@@ -20,24 +25,108 @@ def drop_na_inputs(*, input_data: pd.DataFrame) -> pd.DataFrame:
     return validated_data
 
 
-def validate_inputs(*, input_data: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[dict]]:
-    """Check model inputs for unprocessable values."""
+def validate_inputs(
+    *, input_data: pd.DataFrame, columnar: bool = False
+) -> Tuple[pd.DataFrame, Optional[dict]]:
+    """Check model inputs for unprocessable values.
+    With columnar=True the checks run one column at a time with
+    vectorized pandas operations instead of building one pydantic
+    object per row. The errors keep the same structure.
+    """
 
+    input_data, city_errors = encode_city(input_data=input_data)
     relevant_data = input_data[config.model.features].copy()
     validated_data = drop_na_inputs(input_data=relevant_data)
     errors = None
 
-    try:
-        # replace numpy nans so that pydantic can validate
-        MultipleDataInputs(
-            inputs=validated_data.replace({np.nan: None}).to_dict(orient="records")
-        )
-    except ValidationError as error:
-        errors = error.json()
+    if columnar:
+        errors = validate_columns(input_data=validated_data)
+    else:
+        try:
+            # replace numpy nans so that pydantic can validate
+            MultipleDataInputs(
+                inputs=validated_data.replace({np.nan: None}).to_dict(orient="records")
+            )
+        except ValidationError as error:
+            errors = error.json()
+
+    if errors:
+        # rows are numbered as in the inputs, before the rows with nulls are dropped
+        kept = np.flatnonzero(relevant_data.notna().all(axis=1).to_numpy())
+        errors = json.loads(errors)
+        for error in errors:
+            error["loc"][1] = int(kept[error["loc"][1]])
+        errors = json.dumps(errors, indent=2)
+
+    if city_errors:
+        errors = json.dumps(city_errors + json.loads(errors or "[]"), indent=2)
 
     return validated_data, errors
 
 
+# Strings accepted as booleans, same as pydantic's bool validator.
+BOOL_STRINGS = {"0", "off", "f", "false", "n", "no", "1", "on", "t", "true", "y", "yes"}
+# Strings accepted as integers, same as int(): "3" and " -4 " but not "3.0"
+INT_STRING = r"\s*[+-]?\d+\s*"
+
+TYPE_ERRORS = {
+    float: ("value is not a valid float", "type_error.float"),
+    int: ("value is not a valid integer", "type_error.integer"),
+    bool: ("value could not be parsed to a boolean", "type_error.bool"),
+}
+
+
+def invalid_values(*, values: pd.Series, field_type: type) -> np.ndarray:
+    """Mask of the values that cannot be parsed as field_type."""
+
+    present = values.notna().to_numpy()
+    if values.dtype == object:
+        numeric = pd.to_numeric(values, errors="coerce")
+        invalid = present & numeric.isna().to_numpy()
+        if field_type is bool:
+            is_bool_string = values.astype(str).str.lower().isin(BOOL_STRINGS)
+            invalid &= ~is_bool_string.to_numpy()
+            numeric = numeric.fillna(0)
+        numeric = numeric.to_numpy(dtype=float)
+    else:
+        invalid = np.zeros(len(values), dtype=bool)
+        numeric = values.to_numpy(dtype=float)
+
+    # NaNs are nulls, and every field is Optional
+    with np.errstate(invalid="ignore"):
+        if field_type is bool:
+            invalid |= present & (numeric != 0) & (numeric != 1)
+        elif field_type is int:
+            # 3.5 is not an integer, DataInputSchema rejects it too
+            invalid |= present & ~(np.isfinite(numeric) & (numeric == np.floor(numeric)))
+    if field_type is int and values.dtype == object:
+        is_string = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        is_int_string = values.astype(str).str.fullmatch(INT_STRING).to_numpy(dtype=bool)
+        invalid |= is_string & ~is_int_string
+    return invalid
+
+
+def validate_columns(*, input_data: pd.DataFrame) -> Optional[str]:
+    """Validate every feature column against DataInputSchema at once."""
+
+    errors = []
+    for position, field in enumerate(config.model.features):
+        field_type = feature_types()[field]
+        invalid = invalid_values(values=input_data[field], field_type=field_type)
+        msg, error_type = TYPE_ERRORS[field_type]
+        errors.extend(
+            (row, position, {"loc": ["inputs", row, field], "msg": msg, "type": error_type})
+            for row in np.flatnonzero(invalid).tolist()
+        )
+
+    if not errors:
+        return None
+
+    # pydantic reports errors row by row, in field order
+    errors.sort(key=lambda error: error[:2])
+    return json.dumps([error for _, _, error in errors], indent=2)
+
+
 class DataInputSchema(BaseModel):
     bedrooms: Optional[float]
     bathrooms: Optional[float]
@@ -52,6 +141,9 @@ class DataInputSchema(BaseModel):
     yr_built: Optional[int]
     yr_renovated: Optional[int]
 
+    # Compact alternative to the dummy variables: city name or code
+    city: Optional[Union[StrictInt, str]] = None
+
     # Dummy variables
     city_Algona: Optional[bool]
     city_Auburn: Optional[bool]
@@ -97,5 +189,23 @@ class DataInputSchema(BaseModel):
     city_Woodinville: Optional[bool]
     city_Yarrow_Point: Optional[bool]
 
+    @validator("*", pre=True)
+    def integral_ints(cls, value: Any, field: ModelField) -> Any:
+        # pydantic would truncate 3.5 to 3, a value with decimals is an error
+        if field.type_ is int and isinstance(value, float) and not value.is_integer():
+            raise IntegerError()
+        return value
+
+
 class MultipleDataInputs(BaseModel):
     inputs: List[DataInputSchema]
+
+
+@lru_cache(maxsize=None)
+def feature_types() -> Dict[str, type]:
+    """Python type of every model feature, e.g. Optional[int] -> int"""
+    return {
+        field: get_args(hint)[0]
+        for field, hint in get_type_hints(DataInputSchema).items()
+        if field in config.model.features
+    }
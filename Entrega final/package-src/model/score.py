@@ -0,0 +1,193 @@
+"""
+Batch scoring of CSV or Parquet files.
+
+    model-score input.csv output.parquet --id-column id --workers 8
+
+The input is read in chunks and the chunks are scored on a process
+pool, so files larger than memory can be scored. The output has one
+row per input row: the row ID (the --id-column values, or the row
+number) and the prediction. Rows with missing values or that fail
+validation get a null prediction; the rest of their chunk is scored.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import typing as t
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from model.config.core import config
+from model.predict import get_model, preload
+from model.processing.validation import validate_inputs
+
+_logger = logging.getLogger(__name__)
+
+ROW_ID = "row_id"
+PREDICTION = "prediction"
+
+
+def read_chunks(
+    *, file_path: Path, chunk_size: int, id_column: t.Optional[str] = None
+) -> t.Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet file `chunk_size` rows at a time. The ID
+    column of a CSV gets the dtype of the whole column in every chunk,
+    e.g. object in all of them if a later chunk has non-numeric IDs.
+    """
+
+    if file_path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        with pq.ParquetFile(file_path) as parquet_file:
+            for batch in parquet_file.iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+    else:
+        dtype = None
+        if id_column is not None:
+            ids = pd.read_csv(file_path, usecols=[id_column], low_memory=False)
+            dtype = {id_column: ids[id_column].dtype}
+        with pd.read_csv(file_path, chunksize=chunk_size, dtype=dtype) as reader:
+            yield from reader
+
+
+def score_chunk(
+    *, chunk: pd.DataFrame, version: str
+) -> t.Tuple[np.ndarray, t.Optional[str]]:
+    """
+    Predictions of a chunk, aligned with its rows. Runs in the pool
+    workers, on the model they loaded when they started. Rows that
+    fail validation are left null and the others are scored.
+    """
+
+    model = get_model(version)
+    validated_data, errors = validate_inputs(
+        input_data=chunk, columnar=config.app_config.columnar_validation
+    )
+    if errors:
+        # the error locations are row positions in the chunk
+        failed = {error["loc"][1] for error in json.loads(errors)}
+        validated_data = validated_data.drop(index=chunk.index[sorted(failed)], errors="ignore")
+
+    predictions = np.full(len(chunk), np.nan)
+    if not validated_data.empty:
+        scored = model.predict(validated_data[config.model.features])
+        predictions[chunk.index.get_indexer(validated_data.index)] = scored
+    return predictions, errors
+
+
+def score_file(
+    *,
+    input_path: Path,
+    output_path: Path,
+    id_column: t.Optional[str] = None,
+    chunk_size: int = 50_000,
+    workers: t.Optional[int] = None,
+) -> dict:
+    """
+    Score a whole file into a Parquet file, keeping at most two chunks
+    per worker in flight. Returns a summary of the run.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    workers = workers or os.cpu_count() or 1
+    # Loaded before the pool starts, forked workers share it copy-on-write
+    preload()
+    version = get_model().version
+    id_name = id_column or ROW_ID
+    summary = {"rows": 0, "scored": 0, "failed_rows": 0, "version": version}
+
+    pending: "deque[t.Tuple[pd.Series, Future]]" = deque()
+    writer: t.Optional[pq.ParquetWriter] = None
+
+    def write_next() -> None:
+        nonlocal writer
+        row_ids, future = pending.popleft()
+        predictions, errors = future.result()
+        if errors:
+            failed = {error["loc"][1] for error in json.loads(errors)}
+            summary["failed_rows"] += len(failed)
+            _logger.warning(
+                "%s rows of the chunk starting at row %s failed validation: %s",
+                len(failed),
+                row_ids.iloc[0],
+                errors,
+            )
+        table = pa.table(
+            {
+                id_name: pa.Array.from_pandas(row_ids),
+                PREDICTION: pa.array(predictions),
+            }
+        )
+        if writer is None:
+            schema = table.schema.with_metadata({"model_version": version})
+            writer = pq.ParquetWriter(output_path, schema)
+        writer.write_table(table.cast(writer.schema))
+        summary["rows"] += len(table)
+        summary["scored"] += int(np.isfinite(predictions).sum())
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=preload) as executor:
+            offset = 0
+            chunks = read_chunks(
+                file_path=input_path, chunk_size=chunk_size, id_column=id_column
+            )
+            for chunk in chunks:
+                chunk = chunk.reset_index(drop=True)
+                if id_column is None:
+                    row_ids = pd.Series(np.arange(offset, offset + len(chunk)))
+                else:
+                    row_ids = chunk[id_column]
+                offset += len(chunk)
+
+                future = executor.submit(score_chunk, chunk=chunk, version=version)
+                pending.append((row_ids, future))
+                if len(pending) >= 2 * workers:
+                    write_next()
+
+            while pending:
+                write_next()
+
+        if writer is None:
+            # archivo de entrada vacío: se escribe igual un Parquet sin filas
+            schema = pa.schema([(id_name, pa.int64()), (PREDICTION, pa.float64())])
+            writer = pq.ParquetWriter(output_path, schema.with_metadata({"model_version": version}))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return summary
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="model-score", description="Score a CSV or Parquet file into Parquet."
+    )
+    parser.add_argument("input", type=Path, help="CSV or Parquet file to score")
+    parser.add_argument("output", type=Path, help="Parquet file to write")
+    parser.add_argument("--id-column", help="column kept as row ID (default: row number)")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    summary = score_file(
+        input_path=args.input,
+        output_path=args.output,
+        id_column=args.id_column,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    print(summary)
+    return 1 if summary["failed_rows"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
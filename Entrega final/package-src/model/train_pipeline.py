@@ -1,27 +1,152 @@
+import argparse
+import typing as t
+from datetime import datetime, timezone
+
 import numpy as np
 import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
 
+from model import __version__ as _version
 from model.config.core import config
 from model.pipeline import housing_pipe
-from model.processing.data_manager import load_dataset, save_pipeline
+from model.processing.data_manager import (
+    dataset_key,
+    list_versions,
+    load_lineage,
+    load_pipeline,
+    load_training_data,
+    model_file_name,
+    save_pipeline,
+)
 
 
 def run_training() -> None:
     """Train the model."""
 
-    # Load pre-split training dataset
-    data = load_dataset(file_name=config.app_config.train_data_file)
-
-    # Separate target and features
-    X_train = data[config.model.features]
-    y_train = data[config.model.target]
+    # Load pre-split training dataset, features and target
+    file_name = config.app_config.train_data_file
+    X_train, y_train = load_training_data(file_name=file_name)
 
     # Fit the regression model
     housing_pipe.fit(X_train, y_train)
 
     # Persist trained pipeline
-    save_pipeline(pipeline_to_persist=housing_pipe)
+    lineage = {
+        "version": _version,
+        "base_version": None,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "data": [data_record(file_name=file_name, rows=len(X_train))],
+    }
+    save_pipeline(pipeline_to_persist=housing_pipe, lineage=lineage)
+
+
+def run_incremental_training(
+    *,
+    file_name: str,
+    version: str,
+    base_version: t.Optional[str] = None,
+    max_new_stages: t.Optional[int] = None,
+    holdout_fraction: t.Optional[float] = None,
+) -> dict:
+    """
+    Add boosting stages to a persisted model, fitted on new data only.
+    The new stages are fitted with warm start on part of the new data,
+    and the rest is held out to keep only the number of stages with the
+    lowest held-out error (possibly none). Saves the result as `version`
+    and returns its lineage.
+    """
+
+    base_version = base_version or list_versions()[-1]
+    max_new_stages = max_new_stages or config.model.incremental_max_stages
+    holdout_fraction = holdout_fraction or config.model.incremental_holdout
+
+    pipeline = load_pipeline(file_name=model_file_name(version=base_version))
+    estimator = pipeline.steps[-1][1]
+    if not isinstance(estimator, GradientBoostingRegressor):
+        raise ValueError(
+            f"Incremental training needs gradient boosting, not {type(estimator).__name__}"
+        )
+
+    X, y = load_training_data(file_name=file_name)
+    X_fit, X_holdout, y_fit, y_holdout = train_test_split(
+        X, y, test_size=holdout_fraction, random_state=config.model.random_state
+    )
+
+    # Warm start keeps the fitted stages and fits the new ones on X_fit
+    base_stages = estimator.estimators_.shape[0]
+    estimator.set_params(warm_start=True, n_estimators=base_stages + max_new_stages)
+    pipeline.fit(X_fit, y_fit)
+
+    # Early stopping: held-out error after each stage, from the base model on
+    for _, step in pipeline.steps[:-1]:
+        X_holdout = step.transform(X_holdout)
+    holdout_errors = [
+        mean_squared_error(y_holdout, prediction)
+        for prediction in estimator.staged_predict(X_holdout)
+    ][base_stages - 1 :]
+    best = int(np.argmin(holdout_errors))
+    keep_stages(estimator=estimator, n_stages=base_stages + best)
+    estimator.set_params(warm_start=False)
+
+    base_lineage = load_lineage(version=base_version) or {"data": []}
+    lineage = {
+        "version": version,
+        "base_version": base_version,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "data": base_lineage["data"] + [data_record(file_name=file_name, rows=len(X))],
+        "stages": {"base": base_stages, "added": best, "tried": max_new_stages},
+        "holdout_rmse": {
+            "base": float(np.sqrt(holdout_errors[0])),
+            "final": float(np.sqrt(holdout_errors[best])),
+        },
+    }
+    save_pipeline(pipeline_to_persist=pipeline, version=version, lineage=lineage)
+    return lineage
+
+
+def keep_stages(*, estimator: GradientBoostingRegressor, n_stages: int) -> None:
+    """
+    Drop the boosting stages after the first n_stages, the same
+    way sklearn trims a model stopped early.
+    """
+    estimator.estimators_ = estimator.estimators_[:n_stages]
+    estimator.train_score_ = estimator.train_score_[:n_stages]
+    if hasattr(estimator, "oob_improvement_"):
+        estimator.oob_improvement_ = estimator.oob_improvement_[:n_stages]
+        estimator.oob_scores_ = estimator.oob_scores_[:n_stages]
+        estimator.oob_score_ = estimator.oob_scores_[-1]
+    estimator.n_estimators_ = n_stages
+    estimator.set_params(n_estimators=n_stages)
+
+
+def data_record(*, file_name: str, rows: int) -> dict:
+    """Which data a model saw: the file and a hash of its content."""
+    return {"file": file_name, "key": dataset_key(file_name=file_name), "rows": rows}
 
 
 if __name__ == "__main__":
-    run_training()
+    parser = argparse.ArgumentParser()
+    # Sin argumentos entrena desde cero; con --incremental agrega etapas con datos nuevos
+    parser.add_argument("--incremental", metavar="FILE", help="new data, in model/datasets")
+    parser.add_argument("--version", help="version of the incremental model")
+    parser.add_argument("--base-version", help="model to start from (default: latest)")
+    parser.add_argument("--max-new-stages", type=int)
+    parser.add_argument("--holdout", type=float)
+    args = parser.parse_args()
+
+    if args.incremental:
+        if not args.version:
+            parser.error("--incremental needs --version")
+        print(
+            run_incremental_training(
+                file_name=args.incremental,
+                version=args.version,
+                base_version=args.base_version,
+                max_new_stages=args.max_new_stages,
+                holdout_fraction=args.holdout,
+            )
+        )
+    else:
+        run_training()
@@ -44,7 +44,8 @@ setup(
     packages=find_packages(exclude=("tests",)),
     package_data={"model": ["VERSION"]},
     install_requires=list_reqs(),
-    extras_require={},
+    extras_require={"batch": ["pyarrow"]},
+    entry_points={"console_scripts": ["model-score=model.score:main"]},
     include_package_data=True,
     license="BSD-3",
     classifiers=[
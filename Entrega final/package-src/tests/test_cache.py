@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from model import __version__ as _version
+from model.cache import PredictionCache
+from model.config.core import config
+from model.predict import get_pipeline
+
+
+class CountingModel:
+    """Wraps the trained pipeline and records how many rows it scores."""
+
+    def __init__(self):
+        self.rows_scored = 0
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        self.rows_scored += len(X)
+        return get_pipeline().predict(X=X)
+
+
+def test_cache_matches_model_and_scores_duplicates_once(sample_input_data):
+
+    # Given
+    X = sample_input_data[config.model.features].iloc[:50]
+    batch = pd.concat([X, X.iloc[:10]], ignore_index=True)
+    cache = PredictionCache(max_size=1000, version=_version)
+    model = CountingModel()
+
+    # When
+    first = cache.predict(model=model, X=batch)
+    second = cache.predict(model=model, X=batch)
+
+    # Then
+    np.testing.assert_allclose(first, get_pipeline().predict(X=batch))
+    np.testing.assert_allclose(second, first)
+    assert model.rows_scored == 50
+    assert cache.misses == 50
+    assert cache.hits == 50
+
+
+def test_cache_evicts_least_recently_used(sample_input_data):
+
+    # Given
+    X = sample_input_data[config.model.features]
+    cache = PredictionCache(max_size=2, version=_version)
+    model = CountingModel()
+
+    # When
+    cache.predict(model=model, X=X.iloc[[0]])
+    cache.predict(model=model, X=X.iloc[[1]])
+    cache.predict(model=model, X=X.iloc[[0]])
+    cache.predict(model=model, X=X.iloc[[2]])
+    cache.predict(model=model, X=X.iloc[[0]])
+
+    # Then
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.hits == 2
+    assert model.rows_scored == 3
+
+
+def test_cache_expires_entries_after_ttl(sample_input_data, monkeypatch):
+
+    # Given
+    X = sample_input_data[config.model.features].iloc[[0]]
+    cache = PredictionCache(max_size=10, ttl=60, version=_version)
+    model = CountingModel()
+    now = [1000.0]
+    monkeypatch.setattr("model.cache.time.monotonic", lambda: now[0])
+
+    # When
+    cache.predict(model=model, X=X)
+    now[0] += 61
+    cache.predict(model=model, X=X)
+
+    # Then
+    assert model.rows_scored == 2
+    assert cache.hits == 0
@@ -0,0 +1,32 @@
+import shutil
+
+import pandas as pd
+
+from model.config.core import config
+from model.processing import data_manager
+from model.processing.data_manager import load_dataset, load_training_data
+
+
+def test_training_data_cache_follows_raw_file(tmp_path, monkeypatch):
+
+    # Given
+    file_name = config.app_config.test_data_file
+    shutil.copy(data_manager.DATASET_DIR / file_name, tmp_path)
+    monkeypatch.setattr(data_manager, "DATASET_DIR", tmp_path)
+    monkeypatch.setattr(data_manager, "DATASET_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(config.app_config, "dataset_cache", True)
+    raw = load_dataset(file_name=file_name)
+
+    # When
+    X, y = load_training_data(file_name=file_name)
+    first_entries = list((tmp_path / "cache").iterdir())
+    raw.iloc[:10].to_csv(tmp_path / file_name, index=False)
+    X_changed, _ = load_training_data(file_name=file_name)
+    second_entries = list((tmp_path / "cache").iterdir())
+
+    # Then
+    pd.testing.assert_frame_equal(X, raw[config.model.features].astype(float))
+    pd.testing.assert_series_equal(y, raw[config.model.target].astype(float))
+    assert len(first_entries) == len(second_entries) == 1
+    assert first_entries != second_entries
+    assert len(X_changed) == 10
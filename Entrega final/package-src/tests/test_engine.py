@@ -0,0 +1,67 @@
+import shutil
+
+import numpy as np
+
+from model import __version__ as _version
+from model.config.core import config
+from model.engine import CompiledPipeline, load_trees
+from model.processing import data_manager
+from model.processing.data_manager import load_mmap_pipeline, load_pipeline
+
+pipeline_file_name = f"{config.app_config.pipeline_save_file}{_version}.pkl"
+
+
+def test_compiled_pipeline_matches_sklearn(sample_input_data):
+
+    # Given
+    X = sample_input_data[config.model.features]
+    pipeline = load_pipeline(file_name=pipeline_file_name)
+    compiled = load_pipeline(file_name=pipeline_file_name, compiled=True)
+
+    # When
+    expected = pipeline.predict(X)
+    result = compiled.predict(X)
+
+    # Then
+    assert isinstance(compiled, CompiledPipeline)
+    assert result.shape == expected.shape
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-9)
+
+
+def test_vectorized_traversal_matches_sklearn(sample_input_data, monkeypatch):
+
+    # Given
+    X = sample_input_data[config.model.features]
+    pipeline = load_pipeline(file_name=pipeline_file_name)
+    compiled = load_pipeline(file_name=pipeline_file_name, compiled=True)
+    monkeypatch.setattr("model.engine.CHUNK_SIZE", 100)
+
+    # When
+    single = compiled.ensemble.predict_vectorized(X.iloc[:1])
+    chunked = compiled.ensemble.predict_vectorized(X)
+
+    # Then
+    np.testing.assert_allclose(single, pipeline.predict(X.iloc[:1]), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(chunked, pipeline.predict(X), rtol=0, atol=1e-9)
+
+
+def test_mmap_artifact_round_trip(sample_input_data, tmp_path, monkeypatch):
+
+    # Given
+    X = sample_input_data[config.model.features]
+    pipeline = load_pipeline(file_name=pipeline_file_name)
+    shutil.copy(data_manager.TRAINED_MODEL_DIR / pipeline_file_name, tmp_path)
+    monkeypatch.setattr(data_manager, "TRAINED_MODEL_DIR", tmp_path)
+    trees_file_name = f"{config.app_config.pipeline_save_file}{_version}.trees"
+
+    # When
+    built = load_mmap_pipeline(
+        file_name=trees_file_name, pipeline_file_name=pipeline_file_name
+    )
+    mapped = load_trees(file_path=tmp_path / trees_file_name, version=_version)
+
+    # Then
+    assert (tmp_path / trees_file_name).is_file()
+    assert not mapped.ensemble.threshold.flags.writeable
+    for compiled in (built, mapped):
+        np.testing.assert_allclose(compiled.predict(X), pipeline.predict(X), rtol=0, atol=1e-9)
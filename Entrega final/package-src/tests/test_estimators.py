@@ -0,0 +1,57 @@
+import pytest
+
+from model.config.core import ModelConfig, config
+from model.estimators import ESTIMATORS, build_estimator, validate_params
+
+
+@pytest.mark.parametrize("name", sorted(ESTIMATORS))
+def test_every_backend_fits_and_predicts(name, sample_input_data):
+
+    # Given
+    if name == "xgboost":
+        pytest.importorskip("xgboost")
+    X = sample_input_data[config.model.features].iloc[:200]
+    y = sample_input_data[config.model.target].iloc[:200]
+    estimator = build_estimator(name=name, params={}, random_state=0)
+
+    # When
+    estimator.fit(X, y)
+
+    # Then
+    assert estimator.predict(X).shape == (200,)
+
+
+def test_model_config_validates_backend_params():
+
+    # Given
+    fields = {**config.model.dict(), "estimator": "random_forest"}
+
+    # When
+    parsed = ModelConfig(
+        **{**fields, "estimator_params": {"random_forest": {"n_estimators": "50"}}}
+    )
+
+    # Then
+    assert parsed.estimator_params["random_forest"]["n_estimators"] == 50
+    with pytest.raises(ValueError):
+        ModelConfig(**{**fields, "estimator": "svm"})
+    with pytest.raises(ValueError):
+        ModelConfig(**{**fields, "estimator_params": {"xgboost": {"max_depth": "deep"}}})
+
+
+@pytest.mark.parametrize(
+    "name, params",
+    [("random_forest", {"max_dept": 3}), ("gradient_boosting", {"loss": "huber"})],
+)
+def test_unknown_backend_params_are_rejected(name, params):
+
+    # Given
+    fields = {**config.model.dict(), "estimator_params": {name: params}}
+
+    # Then
+    with pytest.raises(ValueError):
+        validate_params(name=name, params=params)
+    with pytest.raises(ValueError):
+        build_estimator(name=name, params=params)
+    with pytest.raises(ValueError):
+        ModelConfig(**fields)
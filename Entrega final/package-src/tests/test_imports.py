@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+
+# Corre en un intérprete nuevo para medir la importación en frío
+IMPORT_CHECK = """
+import json, sys, time
+start = time.perf_counter()
+import model.predict
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "sklearn": "sklearn" in sys.modules,
+    "strictyaml": "strictyaml" in sys.modules,
+    "pipeline_loaded": model.predict._active is not None,
+}))
+"""
+
+
+def test_importing_predict_is_lazy():
+
+    # When
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK], capture_output=True, check=True, text=True
+    )
+    result = json.loads(output.stdout)
+
+    # Then
+    assert not result["sklearn"]
+    assert not result["strictyaml"]
+    assert not result["pipeline_loaded"]
+    # generous bound, the import is dominated by pandas
+    assert result["seconds"] < 5
+
+
+def test_preload_loads_pipeline_once():
+
+    # Given
+    import model.predict as predict
+
+    # When
+    predict.preload()
+    pipeline = predict.get_pipeline()
+    predict.preload()
+
+    # Then
+    assert pipeline is not None
+    assert predict.get_pipeline() is pipeline
@@ -0,0 +1,74 @@
+import pytest
+
+from model import metrics
+from model.predict import make_prediction
+
+
+@pytest.fixture()
+def enabled_metrics():
+    metrics.REGISTRY.clear()
+    metrics.enable()
+    yield metrics
+    metrics.enable(False)
+    metrics.REGISTRY.clear()
+
+
+def test_make_prediction_records_stages(sample_input_data, enabled_metrics):
+
+    # Given
+    batch = sample_input_data.iloc[:20]
+
+    # When
+    make_prediction(input_data=batch)
+    make_prediction(input_data=batch.assign(bedrooms="many"))
+
+    # Then
+    for stage in ("dataframe", "validate_inputs"):
+        assert metrics.STAGE_SECONDS.count(stage) == 2
+    assert metrics.STAGE_SECONDS.count("predict") == 1
+    assert metrics.BATCH_ROWS.count() == 2
+    assert metrics.PREDICTION_ERRORS.value("validate_inputs") == 1
+
+
+def test_disabled_metrics_record_nothing(sample_input_data):
+
+    # Given
+    metrics.REGISTRY.clear()
+
+    # When
+    make_prediction(input_data=sample_input_data.iloc[:5])
+
+    # Then
+    assert not metrics.enabled()
+    assert metrics.STAGE_SECONDS.count("predict") == 0
+    assert metrics.BATCH_ROWS.count() == 0
+
+
+def test_render_prometheus_text(enabled_metrics):
+
+    # Given
+    histogram = metrics.Histogram("test_seconds", "Test.", buckets=(0.1, 1.0), labels=("stage",))
+    counter = metrics.Counter("test_total", "Test.", labels=("kind",))
+    registry = metrics.Registry()
+    registry.register(histogram)
+    registry.register(counter)
+
+    # When
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "predict")
+    counter.inc('say "hi"')
+    text = registry.render()
+
+    # Then
+    assert text.splitlines() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="predict",le="0.1"} 1',
+        'test_seconds_bucket{stage="predict",le="1.0"} 2',
+        'test_seconds_bucket{stage="predict",le="+Inf"} 3',
+        'test_seconds_sum{stage="predict"} 5.55',
+        'test_seconds_count{stage="predict"} 3',
+        "# HELP test_total Test.",
+        "# TYPE test_total counter",
+        'test_total{kind="say \\"hi\\""} 1',
+    ]
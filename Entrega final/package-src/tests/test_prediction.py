@@ -2,7 +2,7 @@ import math
 
 import numpy as np
 
-from model.predict import make_prediction
+from model.predict import make_prediction, make_predictions
 
 
 def test_make_prediction(sample_input_data):
@@ -28,3 +28,26 @@ def test_make_prediction(sample_input_data):
     # Predictions should be finite numbers
     assert math.isfinite(predictions[0])
     assert not math.isnan(predictions[0])
+
+
+def test_make_predictions_matches_single_calls(sample_input_data):
+
+    # Given
+    with_missing = sample_input_data.iloc[1:40].copy()
+    with_missing.iloc[3, 0] = np.nan
+    inputs = [
+        sample_input_data.iloc[:1],
+        with_missing,
+        sample_input_data.iloc[40:45].reset_index(drop=True),
+    ]
+
+    # When
+    results = make_predictions(inputs=inputs)
+
+    # Then
+    assert len(results) == len(inputs)
+    for input_data, result in zip(inputs, results):
+        expected = make_prediction(input_data=input_data)
+        assert result["errors"] is None
+        assert len(result["predictions"]) == len(expected["predictions"])
+        np.testing.assert_allclose(result["predictions"], expected["predictions"])
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from model import __version__ as _version
+from model.predict import make_prediction
+from model.score import main
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_score_file_keeps_row_ids(sample_input_data, tmp_path, suffix):
+
+    # Given
+    data = sample_input_data.drop(columns=["price"]).iloc[:230].copy()
+    data.insert(0, "listing_id", np.arange(1000, 1000 + len(data)))
+    data.loc[data.index[7], "bedrooms"] = np.nan
+    input_path = tmp_path / f"listings{suffix}"
+    output_path = tmp_path / "scores.parquet"
+    if suffix == ".csv":
+        data.to_csv(input_path, index=False)
+    else:
+        data.to_parquet(input_path, index=False)
+
+    # When
+    exit_code = main(
+        [str(input_path), str(output_path), "--id-column", "listing_id",
+         "--chunk-size", "50", "--workers", "2"]
+    )
+    scores = pd.read_parquet(output_path)
+
+    # Then
+    assert exit_code == 0
+    assert scores["listing_id"].tolist() == data["listing_id"].tolist()
+    assert np.isnan(scores["prediction"].iloc[7])
+    expected = make_prediction(input_data=data.drop(index=data.index[7]))["predictions"]
+    np.testing.assert_allclose(scores["prediction"].drop(index=7), expected)
+    assert pq.read_schema(output_path).metadata[b"model_version"] == _version.encode()
+
+
+def test_score_file_nulls_only_invalid_rows(sample_input_data, tmp_path):
+
+    # Given
+    data = sample_input_data.drop(columns=["price"]).iloc[:120].copy()
+    # numeric IDs in the first chunk, text IDs from the second one on
+    data.insert(0, "listing_id", [str(i) for i in range(60)] + [f"x{i}" for i in range(60)])
+    data["view"] = data["view"].astype(object)
+    data.loc[data.index[12], "view"] = "high"
+    input_path = tmp_path / "listings.csv"
+    output_path = tmp_path / "scores.parquet"
+    data.to_csv(input_path, index=False)
+
+    # When
+    exit_code = main(
+        [str(input_path), str(output_path), "--id-column", "listing_id",
+         "--chunk-size", "50", "--workers", "2"]
+    )
+    scores = pd.read_parquet(output_path)
+
+    # Then
+    assert exit_code == 1
+    assert scores["listing_id"].tolist() == data["listing_id"].tolist()
+    assert np.isnan(scores["prediction"]).tolist() == [row == 12 for row in range(120)]
+    expected = make_prediction(input_data=data.drop(index=data.index[12]))["predictions"]
+    np.testing.assert_allclose(scores["prediction"].drop(index=12), expected)
@@ -0,0 +1,40 @@
+import shutil
+
+import numpy as np
+
+from model import __version__ as _version
+from model.config.core import config
+from model.processing import data_manager
+from model.processing.data_manager import list_versions, load_lineage, load_pipeline
+from model.train_pipeline import run_incremental_training
+
+
+def test_incremental_training_adds_stages_with_lineage(tmp_path, monkeypatch):
+
+    # Given
+    base_file = data_manager.TRAINED_MODEL_DIR / data_manager.model_file_name()
+    (tmp_path / "trained").mkdir()
+    shutil.copy(base_file, tmp_path / "trained")
+    monkeypatch.setattr(data_manager, "TRAINED_MODEL_DIR", tmp_path / "trained")
+    monkeypatch.setattr(data_manager, "DATASET_CACHE_DIR", tmp_path / "cache")
+    base = load_pipeline(file_name=data_manager.model_file_name())
+    base_stages = base.steps[-1][1].estimators_.shape[0]
+
+    # When
+    lineage = run_incremental_training(
+        file_name=config.app_config.test_data_file, version="0.0.2", max_new_stages=20
+    )
+
+    # Then
+    assert list_versions() == [_version, "0.0.2"]
+    assert load_lineage(version="0.0.2") == lineage
+    assert lineage["base_version"] == _version
+    assert lineage["data"][-1]["file"] == config.app_config.test_data_file
+    assert 0 <= lineage["stages"]["added"] <= 20
+    assert lineage["holdout_rmse"]["final"] <= lineage["holdout_rmse"]["base"]
+    retrained = load_pipeline(file_name=data_manager.model_file_name(version="0.0.2"))
+    estimator = retrained.steps[-1][1]
+    assert estimator.estimators_.shape[0] == base_stages + lineage["stages"]["added"]
+    assert not estimator.warm_start
+    X = data_manager.load_dataset(file_name=config.app_config.test_data_file)
+    assert np.isfinite(estimator.predict(X[config.model.features])).all()
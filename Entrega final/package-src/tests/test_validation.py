@@ -0,0 +1,122 @@
+import json
+
+import pandas as pd
+
+from model.processing.validation import validate_inputs
+
+
+def test_columnar_validation_accepts_valid_inputs(sample_input_data):
+
+    # When
+    pydantic_data, pydantic_errors = validate_inputs(input_data=sample_input_data)
+    columnar_data, columnar_errors = validate_inputs(
+        input_data=sample_input_data, columnar=True
+    )
+
+    # Then
+    assert pydantic_errors is None
+    assert columnar_errors is None
+    assert columnar_data.equals(pydantic_data)
+
+
+def test_columnar_validation_matches_pydantic_errors(sample_input_data):
+
+    # Given
+    data = sample_input_data.copy()
+    data["bedrooms"] = data["bedrooms"].astype(object)
+    data.loc[0, "bedrooms"] = "three"
+    data["sqft_living"] = data["sqft_living"].astype(object)
+    data.loc[5, "sqft_living"] = "big"
+    data["city_Kent"] = data["city_Kent"].astype(int)
+    data.loc[3, "city_Kent"] = 2
+
+    # When
+    _, pydantic_errors = validate_inputs(input_data=data)
+    _, columnar_errors = validate_inputs(input_data=data, columnar=True)
+
+    # Then
+    expected = json.loads(pydantic_errors)
+    result = json.loads(columnar_errors)
+    assert [error["loc"] for error in result] == [error["loc"] for error in expected]
+    assert result[0]["loc"] == ["inputs", 0, "bedrooms"]
+
+
+def test_int_fields_reject_values_with_decimals(sample_input_data):
+
+    # Given
+    values = [3.5, "3.5", "3", " 4 ", 3.0, "3.0", "1e3", 2]
+    data = sample_input_data.iloc[: len(values)].copy()
+    data["view"] = pd.Series(values, index=data.index, dtype=object)
+
+    # When
+    _, pydantic_errors = validate_inputs(input_data=data)
+    _, columnar_errors = validate_inputs(input_data=data, columnar=True)
+
+    # Then
+    expected = json.loads(pydantic_errors)
+    assert json.loads(columnar_errors) == expected
+    assert [error["loc"][1] for error in expected] == [0, 1, 5, 6]
+
+
+def test_city_name_and_code_expand_to_one_hot(sample_input_data):
+
+    # Given
+    one_hot = sample_input_data.drop(columns=["price"])
+    city_columns = [var for var in one_hot.columns if var.startswith("city_")]
+    codes = one_hot[city_columns].to_numpy().argmax(axis=1)
+    by_code = one_hot.drop(columns=city_columns).assign(city=codes)
+    by_name = by_code.assign(
+        city=[city_columns[code][len("city_") :].replace("_", " ") for code in codes]
+    )
+
+    # When
+    expected, _ = validate_inputs(input_data=one_hot)
+    from_code, code_errors = validate_inputs(input_data=by_code, columnar=True)
+    from_name, name_errors = validate_inputs(input_data=by_name)
+
+    # Then
+    assert code_errors is None
+    assert name_errors is None
+    assert from_code.astype(float).equals(expected.astype(float))
+    assert from_name.astype(float).equals(expected.astype(float))
+
+
+def test_unknown_city_is_reported(sample_input_data):
+
+    # Given
+    data = sample_input_data.iloc[:3].assign(city=["Seattle", "Atlantis", 99])
+
+    # When
+    _, errors = validate_inputs(input_data=data, columnar=True)
+
+    # Then
+    assert [error["loc"] for error in json.loads(errors)] == [
+        ["inputs", 1, "city"],
+        ["inputs", 2, "city"],
+    ]
+
+
+def test_mixed_city_names_and_codes(sample_input_data):
+
+    # Given
+    data = sample_input_data.iloc[:5].drop(columns=["price"])
+    city_columns = [var for var in data.columns if var.startswith("city_")]
+    data = data.drop(columns=city_columns)
+    data["bedrooms"] = data["bedrooms"].astype(object)
+    data.loc[data.index[4], "bedrooms"] = "three"
+    # the row without a city (nor city_* columns) is dropped as a null row
+    data = data.assign(city=["Seattle", 3, "Atlantis", None, 99])
+
+    # When
+    validated, errors = validate_inputs(input_data=data, columnar=True)
+
+    # Then
+    assert len(validated) == 4
+    assert validated["city_Seattle"].iloc[0]
+    assert validated[city_columns[3]].iloc[1]
+    # errors are numbered by input row, also after the dropped row
+    assert [error["loc"] for error in json.loads(errors)] == [
+        ["inputs", 2, "city"],
+        ["inputs", 4, "city"],
+        ["inputs", 4, "bedrooms"],
+    ]
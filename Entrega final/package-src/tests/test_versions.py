@@ -0,0 +1,131 @@
+import shutil
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from model import __version__ as _version
+from model import predict
+from model.config.core import config
+from model.processing import data_manager
+from model.processing.data_manager import (
+    list_versions,
+    load_lineage,
+    load_pipeline,
+    save_pipeline,
+)
+
+
+@pytest.fixture()
+def model_store(tmp_path, monkeypatch):
+    """Copy of the trained model directory, with the active model reset."""
+    shutil.copy(
+        data_manager.TRAINED_MODEL_DIR / data_manager.model_file_name(), tmp_path
+    )
+    monkeypatch.setattr(data_manager, "TRAINED_MODEL_DIR", tmp_path)
+    monkeypatch.setattr(predict, "_active", None)
+    monkeypatch.setattr(predict, "_loaded", OrderedDict())
+    return tmp_path
+
+
+def test_save_pipeline_keeps_latest_versions(model_store, monkeypatch):
+
+    # Given
+    monkeypatch.setattr(config.app_config, "models_to_keep", 2)
+    pipeline = load_pipeline(file_name=data_manager.model_file_name())
+
+    # When
+    for version in ["0.0.2", "0.0.10", "0.0.9"]:
+        save_pipeline(pipeline_to_persist=pipeline, version=version)
+
+    # Then
+    assert list_versions() == ["0.0.9", "0.0.10"]
+
+
+def test_activate_swaps_version_served(model_store, sample_input_data):
+
+    # Given
+    pipeline = load_pipeline(file_name=data_manager.model_file_name())
+    save_pipeline(pipeline_to_persist=pipeline, version="0.0.2")
+    before = predict.make_prediction(input_data=sample_input_data.iloc[:5])
+    in_flight = predict.get_model()
+
+    # When
+    predict.activate(version="0.0.2")
+    after = predict.make_prediction(input_data=sample_input_data.iloc[:5])
+
+    # Then
+    assert before["version"] == _version
+    assert after["version"] == "0.0.2"
+    assert predict.active_version() == "0.0.2"
+    np.testing.assert_allclose(after["predictions"], before["predictions"])
+    # a request that read the old model keeps scoring with it
+    assert in_flight.version == _version
+    assert len(in_flight.predict(sample_input_data[config.model.features])) > 0
+    with pytest.raises(ValueError):
+        predict.activate(version="9.9.9")
+    assert predict.active_version() == "0.0.2"
+
+
+def test_request_in_flight_does_not_undo_swap(
+    model_store, sample_input_data, monkeypatch
+):
+
+    # Given
+    pipeline = load_pipeline(file_name=data_manager.model_file_name())
+    save_pipeline(pipeline_to_persist=pipeline, version="0.0.2")
+    submitted_with = predict.active_version()
+    loads = []
+    load_model = predict.load_model
+    monkeypatch.setattr(
+        predict,
+        "load_model",
+        lambda *, version: loads.append(version) or load_model(version=version),
+    )
+
+    # When
+    predict.activate(version="0.0.2")
+    # the request submitted before the swap is scored after it
+    in_flight = predict.make_prediction(
+        input_data=sample_input_data.iloc[:5], version=submitted_with
+    )
+    after = predict.make_prediction(input_data=sample_input_data.iloc[:5])
+
+    # Then
+    assert in_flight["version"] == _version
+    assert after["version"] == "0.0.2"
+    assert predict.active_version() == "0.0.2"
+    # the old version was still loaded, nothing is read from disk again
+    assert loads == ["0.0.2"]
+
+
+def test_save_pipeline_drops_stale_trees(model_store, monkeypatch):
+
+    # Given
+    pipeline = load_pipeline(file_name=data_manager.model_file_name())
+    trees = model_store / data_manager.model_file_name(version="0.0.2", suffix=".trees")
+    monkeypatch.setattr(config.app_config, "mmap_artifact", True)
+    save_pipeline(pipeline_to_persist=pipeline, version="0.0.2")
+    assert trees.is_file()
+
+    # When
+    monkeypatch.setattr(config.app_config, "mmap_artifact", False)
+    save_pipeline(pipeline_to_persist=pipeline, version="0.0.2")
+
+    # Then
+    assert not trees.exists()
+    assert "0.0.2" in list_versions()
+
+
+def test_save_pipeline_without_lineage_drops_old_lineage(model_store):
+
+    # Given
+    pipeline = load_pipeline(file_name=data_manager.model_file_name())
+    save_pipeline(pipeline_to_persist=pipeline, version="0.0.2", lineage={"data": []})
+    assert load_lineage(version="0.0.2") == {"data": []}
+
+    # When
+    save_pipeline(pipeline_to_persist=pipeline, version="0.0.2")
+
+    # Then
+    assert load_lineage(version="0.0.2") is None
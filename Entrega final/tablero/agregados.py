@@ -0,0 +1,217 @@
+# ==============================================================
+# CONSTRUCCIÓN DE LOS PARQUET DEL TABLERO A PARTIR DEL CSV DE VIVIENDAS
+# Reemplaza los pasos manuales de data/mapa_calor.ipynb:
+# - precio_ciudad_map.parquet: promedio de price / sqft_lot por ciudad, con
+#   el número de ventas y las coordenadas, en un solo groupby vectorizado;
+# - data_graphs.parquet: las columnas que usan los gráficos descriptivos.
+# Cada parquet guarda en sus metadatos hasta qué byte del CSV ya se procesó.
+# Si después se agregan ventas al final del CSV solo se leen las filas nuevas:
+# el promedio por ciudad se actualiza con las sumas y los conteos, y las filas
+# nuevas se añaden a data_graphs. Si lo ya procesado cambió se recalcula todo.
+# Los archivos se escriben de forma atómica (temporal + os.replace).
+# Las coordenadas se conservan del mapa anterior; solo las ciudades nuevas se
+# buscan con geopy (Nominatim), si está instalado.
+# Uso: python agregados.py [--csv "../../data/USA Housing Dataset.csv"] [--completo]
+#      [--map-file ...] [--data-file ...] [--stats-file ...]
+# ==============================================================
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from stats import DATA_FILE, STATS_FILE, cargar_stats
+
+CSV_FILE = os.path.join("..", "..", "data", "USA Housing Dataset.csv")
+MAP_FILE = "precio_ciudad_map.parquet"
+GRAPH_COLUMNS = [
+    "price", "yr_built", "view", "sqft_above",
+    "sqft_living", "bathrooms", "bedrooms",
+]
+MAP_COLUMNS = ["city", "price_per_sqft", "sales", "lat", "lon"]
+
+# clave de los metadatos del parquet con el estado de la última lectura
+ESTADO = b"agregados"
+# bytes finales de lo ya procesado con los que se comprueba que no cambió
+BLOQUE_CONTROL = 1 << 20
+
+
+def huella(csv_file, offset):
+    """Hash del encabezado y del último bloque del CSV antes de `offset`."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(csv_file, "rb") as archivo:
+        digest.update(archivo.readline())
+        archivo.seek(max(offset - BLOQUE_CONTROL, 0))
+        digest.update(archivo.read(min(offset, BLOQUE_CONTROL)))
+    return digest.hexdigest()
+
+
+def leer_estado(parquet_file, csv_file):
+    """
+    Byte del CSV hasta el que llega `parquet_file`, o None si el archivo no
+    existe, no tiene estado o lo ya procesado del CSV cambió.
+    """
+    try:
+        metadatos = pq.read_schema(parquet_file).metadata or {}
+        estado = json.loads(metadatos[ESTADO])
+    except (OSError, KeyError, ValueError):
+        return None
+    offset = estado["offset"]
+    if os.path.getsize(csv_file) < offset or huella(csv_file, offset) != estado["huella"]:
+        return None
+    return offset
+
+
+def leer_ventas(csv_file, offset=None):
+    """
+    Ventas del CSV desde el byte `offset` (todas si es None) y el byte en el
+    que termina la última línea completa leída.
+    """
+    with open(csv_file, "rb") as archivo:
+        encabezado = archivo.readline()
+        if offset is not None:
+            archivo.seek(offset)
+        nuevo = archivo.read()
+    # una línea que se está escribiendo todavía se deja para la próxima vez
+    nuevo = nuevo[: nuevo.rfind(b"\n") + 1]
+    inicio = offset if offset is not None else len(encabezado)
+    ventas = pd.read_csv(io.BytesIO(encabezado + nuevo))
+    return ventas, inicio + len(nuevo)
+
+
+def agregar_ciudades(ventas):
+    """Suma y conteo de price / sqft_lot por ciudad en un solo groupby."""
+    return (
+        ventas.assign(price_per_sqft=ventas["price"] / ventas["sqft_lot"])
+        .groupby("city")["price_per_sqft"]
+        .agg(suma="sum", sales="count")
+    )
+
+
+def geocodificar(ciudades):
+    """Coordenadas (lat, lon) de cada ciudad de Washington, NaN si no se encuentran."""
+    coordenadas = pd.DataFrame(index=pd.Index(ciudades, name="city"), columns=["lat", "lon"],
+                               dtype=float)
+    if len(coordenadas) == 0:
+        return coordenadas
+    try:
+        from geopy.extra.rate_limiter import RateLimiter
+        from geopy.geocoders import Nominatim
+    except ImportError:
+        print(f"geopy no está instalado: {len(coordenadas)} ciudades nuevas quedan sin coordenadas")
+        return coordenadas
+
+    geocode = RateLimiter(Nominatim(user_agent="wa_price_map").geocode, min_delay_seconds=1)
+    for ciudad in coordenadas.index:
+        try:
+            ubicacion = geocode(f"{ciudad}, Washington, USA")
+        except Exception:
+            ubicacion = None
+        if ubicacion is not None:
+            coordenadas.loc[ciudad] = [ubicacion.latitude, ubicacion.longitude]
+    return coordenadas
+
+
+def combinar_mapa(anterior, nuevos):
+    """
+    Mapa actualizado con las ventas nuevas: promedio = (suma anterior + suma
+    nueva) / (ventas anteriores + ventas nuevas). `anterior` aporta las
+    coordenadas; las ciudades sin coordenadas se geocodifican.
+    """
+    anterior = anterior.set_index("city")
+    suma = (anterior["price_per_sqft"] * anterior["sales"]).add(nuevos["suma"], fill_value=0)
+    ventas = anterior["sales"].add(nuevos["sales"], fill_value=0)
+    mapa = pd.DataFrame({"price_per_sqft": suma / ventas, "sales": ventas.astype("int64")})
+    mapa = mapa[mapa["sales"] > 0]
+
+    mapa = mapa.join(anterior[["lat", "lon"]])
+    faltantes = mapa.index[mapa["lat"].isna() | mapa["lon"].isna()]
+    mapa.update(geocodificar(faltantes))
+    return mapa.rename_axis("city").reset_index()[MAP_COLUMNS]
+
+
+def escribir_atomico(tabla, destino, offset, csv_file):
+    """Escribe `tabla` en `destino` con el estado de la lectura en los metadatos."""
+    estado = json.dumps({"offset": offset, "huella": huella(csv_file, offset)})
+    tabla = tabla.replace_schema_metadata({**(tabla.schema.metadata or {}), ESTADO: estado})
+    directorio = os.path.dirname(os.path.abspath(destino))
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            pq.write_table(tabla, archivo)
+        # mkstemp deja el archivo solo para su dueño; el tablero puede ser otro usuario
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, destino)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+def sin_estado(parquet_file, columnas):
+    """Contenido de un parquet anterior (p. ej. hecho en el notebook), o vacío."""
+    try:
+        return pd.read_parquet(parquet_file)
+    except OSError:
+        return pd.DataFrame(columns=columnas)
+
+
+def actualizar_mapa(csv_file=CSV_FILE, map_file=MAP_FILE, completo=False):
+    """Actualiza el mapa de precios por ciudad; devuelve las ventas nuevas leídas."""
+    offset = None if completo else leer_estado(map_file, csv_file)
+    ventas, fin = leer_ventas(csv_file, offset)
+    if offset is not None and fin == offset:
+        return 0
+
+    if offset is None:
+        # se recalcula todo, pero se conservan las coordenadas ya encontradas
+        anterior = sin_estado(map_file, MAP_COLUMNS)[["city", "lat", "lon"]]
+        anterior = anterior.assign(price_per_sqft=0.0, sales=0)
+    else:
+        anterior = pd.read_parquet(map_file)
+    mapa = combinar_mapa(anterior, agregar_ciudades(ventas))
+    escribir_atomico(pa.Table.from_pandas(mapa, preserve_index=False), map_file, fin, csv_file)
+    return len(ventas)
+
+
+def actualizar_graficos(csv_file=CSV_FILE, data_file=DATA_FILE, completo=False):
+    """Añade a data_graphs las ventas nuevas; devuelve cuántas filas se añadieron."""
+    offset = None if completo else leer_estado(data_file, csv_file)
+    ventas, fin = leer_ventas(csv_file, offset)
+    if offset is not None and fin == offset:
+        return 0
+
+    nuevas = pa.Table.from_pandas(ventas[GRAPH_COLUMNS], preserve_index=False)
+    if offset is not None:
+        anterior = pq.read_table(data_file)
+        esquema = anterior.schema.remove_metadata()
+        nuevas = pa.concat_tables([anterior.replace_schema_metadata(None), nuevas.cast(esquema)])
+    escribir_atomico(nuevas, data_file, fin, csv_file)
+    return len(ventas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=CSV_FILE)
+    parser.add_argument("--map-file", default=MAP_FILE)
+    parser.add_argument("--data-file", default=DATA_FILE)
+    parser.add_argument("--stats-file", default=None,
+                        help=f"resúmenes de los gráficos (por defecto {STATS_FILE} "
+                             "en la carpeta de --data-file)")
+    parser.add_argument("--completo", action="store_true",
+                        help="recalcular todo en lugar de leer solo las ventas nuevas")
+    args = parser.parse_args()
+    stats_file = args.stats_file or os.path.join(os.path.dirname(args.data_file), STATS_FILE)
+
+    filas_mapa = actualizar_mapa(args.csv, args.map_file, args.completo)
+    filas_graficos = actualizar_graficos(args.csv, args.data_file, args.completo)
+    if filas_graficos:
+        # los resúmenes de los gráficos dependen de data_graphs
+        cargar_stats(args.data_file, stats_file)
+    print(f"{filas_mapa} ventas nuevas en {args.map_file}, "
+          f"{filas_graficos} en {args.data_file}")
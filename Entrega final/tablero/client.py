@@ -0,0 +1,101 @@
+# ==============================================================
+# CLIENTE DEL TABLERO PARA LAS PREDICCIONES
+# Modo "api": una sola sesión de requests por proceso de Streamlit
+# (st.cache_resource), con un pool de conexiones keep-alive, tiempos máximos
+# de conexión y de lectura, y reintentos con espera exponencial ante errores
+# de conexión o 502/503/504. Una lectura que agota su tiempo no se reintenta.
+# Modo "embedded": el tablero importa el paquete `model` y llama a
+# make_prediction en el mismo proceso, sin HTTP ni la validación de la API.
+# Requiere el paquete instalado (model_house_pricing-*.whl).
+# ==============================================================
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (conexión, lectura) en segundos
+TIMEOUT = (3.05, 10)
+RETRIES = 2
+BACKOFF = 0.3
+POOL_SIZE = 10
+
+
+def crear_sesion(retries=RETRIES, pool_size=POOL_SIZE):
+    """Sesión con pool de conexiones y reintentos."""
+    reintentos = Retry(
+        total=retries,
+        connect=retries,
+        # una lectura lenta no se repite, llega al tablero como requests.Timeout
+        read=False,
+        status=retries,
+        backoff_factor=BACKOFF,
+        status_forcelist=(502, 503, 504),
+        # la predicción no cambia nada en el servidor, reintentar el POST es seguro
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adaptador = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size, max_retries=reintentos
+    )
+    sesion = requests.Session()
+    sesion.mount("http://", adaptador)
+    sesion.mount("https://", adaptador)
+    return sesion
+
+
+def espera_maxima(timeout=TIMEOUT, retries=RETRIES):
+    """
+    Segundos que puede tardar una petición en el peor caso: todos los
+    intentos de conexión agotan su tiempo, con sus esperas entre intentos,
+    y luego la lectura agota el suyo.
+    """
+    conexion, lectura = timeout
+    esperas = sum(BACKOFF * 2 ** intento for intento in range(retries))
+    return conexion * (retries + 1) + esperas + lectura
+
+
+def predecir(sesion, api_url, vivienda, timeout=TIMEOUT):
+    """
+    Predicción (log del precio) de una vivienda. Lanza requests.RequestException
+    si la API no responde a tiempo o devuelve un error.
+    """
+    respuesta = sesion.post(api_url, json={"inputs": [vivienda]}, timeout=timeout)
+    respuesta.raise_for_status()
+    return respuesta.json()["predictions"][0]
+
+
+def predecir_lote(sesion, api_url, viviendas, timeout=TIMEOUT):
+    """
+    Predicciones de un DataFrame de viviendas en una sola petición, con el
+    formato columnar de la API (una lista por variable).
+    """
+    columnas = {nombre: viviendas[nombre].tolist() for nombre in viviendas.columns}
+    respuesta = sesion.post(f"{api_url}/columnar", json={"inputs": columnas}, timeout=timeout)
+    respuesta.raise_for_status()
+    return respuesta.json()["predictions"]
+
+
+def cargar_modelo():
+    """Carga el pipeline activo del paquete `model`, una vez por proceso."""
+    from model.predict import get_model
+
+    return get_model()
+
+
+def predecir_local(modelo, vivienda):
+    """
+    Predicción (log del precio) de una vivienda con el modelo cargado en este
+    proceso. Lanza ValueError si las entradas no pasan la validación.
+    """
+    return predecir_local_lote(modelo, pd.DataFrame([vivienda]))[0]
+
+
+def predecir_local_lote(modelo, viviendas):
+    """Predicciones de un DataFrame de viviendas en una sola llamada al modelo."""
+    from model.predict import make_prediction
+
+    resultado = make_prediction(input_data=viviendas, version=modelo.version)
+    if resultado["errors"]:
+        raise ValueError(resultado["errors"])
+    return resultado["predictions"]
@@ -1,24 +1,107 @@
+import os
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import requests
 import numpy as np
 
+from agregados import MAP_FILE
+from client import (cargar_modelo, crear_sesion, espera_maxima, predecir, predecir_local,
+                    predecir_local_lote, predecir_lote)
+from sensitivity import VARIABLES, construir_grilla, curvas, entradas, mapa_ciudades
+from stats import DATA_FILE, cargar_stats
+
 # ---------------------------------------------------
 # CONFIG
 # ---------------------------------------------------
 API_URL = "http://3.214.199.14:8001/api/v1/predict"  #
+# "api" consulta API_URL; "embedded" usa el paquete del modelo en este proceso
+PREDICTION_MODE = os.environ.get("PREDICTION_MODE", "api")
 
 st.set_page_config(page_title="Tablero - Precio de la vivienda en WA, USA", layout="wide")
 
+# ---------------------------------------------------
+# Cliente de la API: una sesión con pool de conexiones por proceso, o el
+# modelo cargado una vez en el proceso (PREDICTION_MODE=embedded). Las
+# predicciones ya consultadas se guardan por combinación de entradas
+# ---------------------------------------------------
+@st.cache_resource
+def get_session():
+    return crear_sesion()
+
+
+@st.cache_resource
+def get_model():
+    return cargar_modelo()
+
+
+@st.cache_data(ttl=3600, max_entries=10_000, show_spinner=False)
+def predict_price(inputs):
+    if PREDICTION_MODE == "embedded":
+        return predecir_local(get_model(), dict(inputs))
+    return predecir(get_session(), API_URL, dict(inputs))
+
+
+# Grilla de variaciones de la vivienda evaluada en una sola llamada
+@st.cache_data(ttl=3600, max_entries=100, show_spinner=False)
+def price_sensitivity(inputs, variables, city_variable, cities):
+    grilla = construir_grilla(dict(inputs), variables, cities, city_variable)
+    if PREDICTION_MODE == "embedded":
+        precios = predecir_local_lote(get_model(), entradas(grilla))
+    else:
+        precios = predecir_lote(get_session(), API_URL, entradas(grilla))
+    return grilla, np.exp(precios)
+
 # ---------------------------------------------------
 # Load cached map data
 # ---------------------------------------------------
+# la fecha del parquet es parte de la clave: agregados.py lo reemplaza al
+# llegar ventas nuevas
+@st.cache_data
+def load_map_data(map_mtime):
+    return pd.read_parquet(MAP_FILE)
+
+df = load_map_data(os.path.getmtime(MAP_FILE))
+
+# ---------------------------------------------------
+# Resúmenes de los gráficos de estadísticas descriptivas
+# ---------------------------------------------------
+# la fecha del parquet es parte de la clave: si cambia se recalculan
 @st.cache_data
-def load_map_data():
-    return pd.read_parquet("precio_ciudad_map.parquet")
+def load_stats(data_mtime):
+    return cargar_stats(DATA_FILE)
+
+
+def stats_figure(chart):
+    """Figura de un gráfico a partir de su resumen precalculado."""
+    if chart["type"] == "box":
+        fig = go.Figure(go.Box(
+            x=chart["categories"],
+            q1=chart["q1"],
+            median=chart["median"],
+            q3=chart["q3"],
+            lowerfence=chart["lowerfence"],
+            upperfence=chart["upperfence"],
+            name=chart["y"],
+        ))
+    else:
+        # celdas vacías transparentes
+        counts = [[c or None for c in row] for row in chart["counts"]]
+        fig = go.Figure([
+            go.Heatmap(x=chart["x_centers"], y=chart["y_centers"], z=counts,
+                       colorscale="Blues", showscale=False, name="Viviendas"),
+            go.Scatter(x=chart["x_centers"], y=chart["p25"], mode="lines",
+                       line=dict(width=0), showlegend=False, hoverinfo="skip"),
+            go.Scatter(x=chart["x_centers"], y=chart["p75"], mode="lines",
+                       line=dict(width=0), fill="tonexty", fillcolor="rgba(255,127,14,0.2)",
+                       name="Rango intercuartílico"),
+            go.Scatter(x=chart["x_centers"], y=chart["p50"], mode="lines+markers",
+                       line=dict(color="#ff7f0e"), name="Mediana"),
+        ])
+    fig.update_layout(title=chart["title"], xaxis_title=chart["x"], yaxis_title=chart["y"])
+    return fig
 
-df = load_map_data()
 
 # ================ESTILO DEL BOTON DE PREDECIR ===========
 # Center and enlarge the button
@@ -39,7 +122,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ================= TABS=================
-tab1, tab2, tab3 = st.tabs(["Predecir precio", "Mapa de calor", "Estadísticas descriptivas"])
+tab1, tab2, tab3, tab4 = st.tabs(["Predecir precio", "Mapa de calor", "Estadísticas descriptivas", "Sensibilidad"])
 
 # =================INGRESO DE INFORMACIÓN =================
 with tab1:
@@ -73,7 +156,25 @@ with tab1:
         sqft_lot = st.number_input("Lot size (sqft)", 400, 50000, 4000, help="Ingrese el área del lote en pies cuadrados")
         sqft_above = st.number_input("Sqft above", 300, 15000, 1500, help="Ingrese el área en pies cuadrados sin contar el sótano")
         sqft_basement = st.number_input("Sqft basement", 0, 10000, 300, help="Ingrese el área en pies cuadrados del sótano")
-        
+
+# Base numeric payload, la API expande la ciudad a las columnas city_*
+payload = {
+    "bedrooms": bedrooms,
+    "bathrooms": bathrooms,
+    "sqft_living": sqft_living,
+    "sqft_lot": sqft_lot,
+    "floors": floors,
+    "waterfront": waterfront,
+    "view": view,
+    "condition": condition,
+    "sqft_above": sqft_above,
+    "sqft_basement": sqft_basement,
+    "yr_built": yr_built,
+    "yr_renovated": yr_renovated,
+    "city": city,
+}
+
+
 # ================= MAPA =================
 with tab2:
     st.header("🏙️ Mapa de calor del precio promedio por sqft")
@@ -99,73 +200,61 @@ with tab3:
     st.header("Estadísticas descriptivas")
     st.markdown("En esta sección se muestran gráficos para visualizar la relación entre el precio de la vivienda y los factores estructurales principales de las viviendas.")
 
-    df_graphs = pd.read_parquet("data_graphs.parquet")
-    
-    # Create a 2-column layout
+    # Resúmenes precalculados (stats.py): el tamaño de cada figura no depende
+    # del número de viviendas
     cols = st.columns(2)
-    
-    # List of graphs: (title, x-column, type)
-    graphs = [
-        ("Price vs Year Built", "yr_built", "scatter"),
-        ("Price vs View", "view", "box"),
-        ("Price vs Sqft Above", "sqft_above", "scatter"),
-        ("Price vs Sqft Living", "sqft_living", "scatter"),
-        ("Price vs Bathrooms", "bathrooms", "scatter"),
-        ("Price vs Bedrooms", "bedrooms", "scatter"),
-    ]
-    
-    # Loop through each graph and place in columns
-    for i, (title, x_col, gtype) in enumerate(graphs):
+    for i, chart in enumerate(load_stats(os.path.getmtime(DATA_FILE))["charts"]):
         col = cols[i % 2]  # alternate columns
-        if gtype == "scatter":
-            fig = px.scatter(df_graphs, x=x_col, y="price", title=title)
-        elif gtype == "box":
-            fig = px.box(df_graphs, x=x_col, y="price", title=title)
-        col.plotly_chart(fig, use_container_width=True)
+        col.plotly_chart(stats_figure(chart), use_container_width=True)
 
-    
-# ================= BOTÓN =================
-if predict_button:
-
-    # Normalize names
-    def normalize_city_name(name):
-        return "city_" + name.replace(" ", "_")
+# ================= SENSIBILIDAD =================
+with tab4:
+    st.header("📈 ¿Qué pasaría si...?")
+    st.markdown("Vea cómo cambia el precio estimado de la vivienda ingresada en **Predecir precio** al variar una característica a la vez, y en cada ciudad. Todas las variaciones se calculan en una sola consulta al modelo.")
 
-    all_cities = df["city"].unique()
-    all_city_columns = [normalize_city_name(c) for c in all_cities]
+    variables = st.multiselect("Características", list(VARIABLES), default=["sqft_living", "yr_built", "bedrooms", "condition"])
+    variable_ciudad = st.selectbox("Característica del mapa por ciudad", list(VARIABLES))
 
-    selected_city_col = normalize_city_name(city)
+    if st.button("Calcular sensibilidad"):
+        try:
+            with st.spinner("Consultando modelo..."):
+                grilla, precios = price_sensitivity(
+                    tuple(payload.items()), tuple(variables), variable_ciudad, tuple(sorted(df["city"].unique()))
+                )
+            st.caption(f"{len(grilla)} predicciones en una sola consulta")
 
-    city_one_hot = {
-        col: (col == selected_city_col) for col in all_city_columns
-    }
+            cols = st.columns(2)
+            for i, (variable, curva) in enumerate(curvas(grilla, precios).items()):
+                fig = px.line(curva, x="valor", y="precio", markers=True, title=f"Precio vs {variable}")
+                fig.add_vline(x=payload[variable], line_dash="dash", line_color="gray")
+                fig.update_layout(xaxis_title=variable, yaxis_title="USD")
+                cols[i % 2].plotly_chart(fig, use_container_width=True)
 
-    # Base numeric payload
-    payload = {
-        "bedrooms": bedrooms,
-        "bathrooms": bathrooms,
-        "sqft_living": sqft_living,
-        "sqft_lot": sqft_lot,
-        "floors": floors,
-        "waterfront": waterfront,
-        "view": view,
-        "condition": condition,
-        "sqft_above": sqft_above,
-        "sqft_basement": sqft_basement,
-        "yr_built": yr_built,
-        "yr_renovated": yr_renovated,
-    }
+            mapa = mapa_ciudades(grilla, precios)
+            fig = go.Figure(go.Heatmap(z=mapa.to_numpy(), x=mapa.columns, y=mapa.index,
+                                       colorscale="Viridis", colorbar=dict(title="USD")))
+            fig.update_layout(title=f"Precio por ciudad vs {variable_ciudad}", xaxis_title=variable_ciudad,
+                              height=900)
+            st.plotly_chart(fig, use_container_width=True)
 
-    # Add city one-hot columns
-    payload.update(city_one_hot)
+        except requests.Timeout:
+            st.error(f"La API no respondió a tiempo (se esperó hasta {espera_maxima():.0f} segundos), "
+                     "intente de nuevo.")
+        except Exception as e:
+            origen = "el modelo" if PREDICTION_MODE == "embedded" else "la API"
+            st.error(f"Error consultando {origen}: {e}")
 
-    st.write("Consultando modelo...")
+# ================= BOTÓN =================
+if predict_button:
 
     try:
-        response = requests.post(API_URL, json={"inputs": [payload]})
-        result = response.json()
-        pred = np.exp(result["predictions"][0])
+        with st.spinner("Consultando modelo..."):
+            pred = np.exp(predict_price(tuple(payload.items())))
         st.success(f"🏡 **Precio estimado de la vivienda: USD {pred:,.2f}**")
 
+    except requests.Timeout:
+        st.error(f"La API no respondió a tiempo (se esperó hasta {espera_maxima():.0f} segundos), "
+                 "intente de nuevo.")
     except Exception as e:
-        st.error(f"Error contactando la API: {e}")
+        origen = "el modelo" if PREDICTION_MODE == "embedded" else "la API"
+        st.error(f"Error consultando {origen}: {e}")
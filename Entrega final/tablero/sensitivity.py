@@ -0,0 +1,85 @@
+# ==============================================================
+# ANÁLISIS DE SENSIBILIDAD ("qué pasaría si")
+# A partir de la vivienda del formulario se arma una grilla de variaciones:
+# una curva por variable (las demás entradas fijas) y una tabla ciudad x
+# variable. Toda la grilla se evalúa en una sola predicción por lotes.
+# ==============================================================
+
+import numpy as np
+import pandas as pd
+
+# Rango de cada variable en la curva, los mismos límites del formulario
+VARIABLES = {
+    "sqft_living": (300, 15000),
+    "sqft_lot": (400, 50000),
+    "yr_built": (1900, 2025),
+    "bedrooms": (1, 10),
+    "bathrooms": (1.0, 5.0),
+    "floors": (1.0, 4.0),
+    "view": (0, 4),
+    "condition": (1, 5),
+}
+ENTERAS = {"sqft_living", "sqft_lot", "yr_built", "bedrooms", "view", "condition"}
+PASOS = 25
+
+# columnas que identifican cada fila de la grilla, no son entradas del modelo
+GRUPO, VALOR = "_grupo", "_valor"
+CIUDAD = "ciudad"
+
+
+def valores(variable, pasos=PASOS):
+    """Valores de la curva de una variable."""
+    minimo, maximo = VARIABLES[variable]
+    if variable in ENTERAS:
+        pasos = min(pasos, int(maximo - minimo) + 1)
+        return np.unique(np.linspace(minimo, maximo, pasos).round().astype(int))
+    return np.linspace(minimo, maximo, pasos)
+
+
+def variar(vivienda, variable, serie):
+    """Copias de la vivienda con `variable` tomando cada valor de la serie."""
+    filas = pd.DataFrame([vivienda] * len(serie))
+    filas[variable] = serie
+    if variable == "sqft_living":
+        # el área sobre el nivel del suelo sigue al área total; el sótano queda igual
+        filas["sqft_above"] = np.maximum(filas["sqft_living"] - filas["sqft_basement"], 0)
+    return filas
+
+
+def construir_grilla(vivienda, variables, ciudades, variable_ciudad, pasos=PASOS):
+    """
+    Grilla de todas las variaciones: una curva por cada variable de
+    `variables` y la variable `variable_ciudad` en cada ciudad.
+    Las columnas GRUPO y VALOR indican a qué curva o celda pertenece cada fila.
+    """
+    partes = []
+    for variable in variables:
+        serie = valores(variable, pasos)
+        partes.append(variar(vivienda, variable, serie).assign(**{GRUPO: variable, VALOR: serie}))
+
+    serie = valores(variable_ciudad, pasos)
+    for ciudad in ciudades:
+        filas = variar({**vivienda, "city": ciudad}, variable_ciudad, serie)
+        partes.append(filas.assign(**{GRUPO: CIUDAD, VALOR: serie}))
+    return pd.concat(partes, ignore_index=True)
+
+
+def entradas(grilla):
+    """Entradas del modelo de la grilla, sin las columnas de identificación."""
+    return grilla.drop(columns=[GRUPO, VALOR])
+
+
+def curvas(grilla, precios):
+    """Precio por valor de cada variable: {variable: DataFrame(valor, precio)}."""
+    resultado = grilla[[GRUPO, VALOR]].assign(precio=precios)
+    return {
+        variable: filas[[VALOR, "precio"]].rename(columns={VALOR: "valor"})
+        for variable, filas in resultado[resultado[GRUPO] != CIUDAD].groupby(GRUPO, sort=False)
+    }
+
+
+def mapa_ciudades(grilla, precios):
+    """Tabla de precios con una fila por ciudad y una columna por valor."""
+    resultado = grilla[[GRUPO, VALOR, "city"]].assign(precio=precios)
+    resultado = resultado[resultado[GRUPO] == CIUDAD]
+    return resultado.pivot(index="city", columns=VALOR, values="precio")
@@ -0,0 +1,174 @@
+# ==============================================================
+# ESTADÍSTICAS PRECALCULADAS PARA LOS GRÁFICOS DEL TABLERO
+# En lugar de enviar al navegador un punto por vivienda, cada gráfico se
+# resume una sola vez: histograma 2D (x vs precio) con la mediana y el rango
+# intercuartílico del precio por intervalo de x, o los cuartiles de cada
+# categoría para los diagramas de caja. El tamaño del resultado depende del
+# número de intervalos, no del número de filas. Se guarda en JSON junto a una
+# clave del parquet y de la configuración y solo se recalcula si cambian.
+# Uso: python stats.py [--data-file data_graphs.parquet] [--output data_graphs_stats.json]
+# ==============================================================
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DATA_FILE = "data_graphs.parquet"
+STATS_FILE = "data_graphs_stats.json"
+TARGET = "price"
+
+# (título, columna x, tipo) de cada gráfico
+CHARTS = [
+    ("Price vs Year Built", "yr_built", "scatter"),
+    ("Price vs View", "view", "box"),
+    ("Price vs Sqft Above", "sqft_above", "scatter"),
+    ("Price vs Sqft Living", "sqft_living", "scatter"),
+    ("Price vs Bathrooms", "bathrooms", "scatter"),
+    ("Price vs Bedrooms", "bedrooms", "scatter"),
+]
+
+# Intervalos por eje y percentiles del precio que se muestran: los valores
+# extremos quedan fuera del histograma y se informan aparte
+BINS = {"x": 40, "y": 40, "price_range": [0.005, 0.995]}
+
+# Versión del formato del resumen, parte de la clave: al cambiarla se recalculan
+# los archivos ya guardados (2: None en lugar de NaN)
+FORMATO = 2
+
+
+def clave_stats(data_file=DATA_FILE, charts=CHARTS, bins=BINS):
+    """Hash del parquet, de la configuración de los gráficos y del formato."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(data_file, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            digest.update(bloque)
+    configuracion = {"charts": charts, "bins": bins, "format": FORMATO}
+    digest.update(json.dumps(configuracion, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def intervalos(valores, max_bins):
+    """
+    Bordes de los intervalos de una variable. Si tiene pocos valores
+    distintos (años, baños) cada valor es su propio intervalo.
+    """
+    unicos = np.unique(valores)
+    if len(unicos) <= max_bins:
+        medios = (unicos[1:] + unicos[:-1]) / 2
+        return np.concatenate([[unicos[0] - 0.5], medios, [unicos[-1] + 0.5]]), unicos
+    bordes = np.linspace(unicos[0], unicos[-1], max_bins + 1)
+    return bordes, (bordes[1:] + bordes[:-1]) / 2
+
+
+def sin_nan(valores):
+    """
+    Lista de valores con None en lugar de NaN (intervalos sin filas): NaN no
+    es JSON válido y el gráfico deja un hueco en los None.
+    """
+    return [None if pd.isna(valor) else valor for valor in valores.tolist()]
+
+
+def resumen_dispersion(data, x, y=TARGET, bins=BINS):
+    """Histograma 2D de x vs y y cuartiles de y por intervalo de x."""
+    bajo, alto = data[y].quantile(bins["price_range"]).to_numpy()
+    dentro = data[data[y].between(bajo, alto)]
+
+    bordes_x, centros_x = intervalos(data[x].to_numpy(dtype=float), bins["x"])
+    bordes_y = np.linspace(bajo, alto, bins["y"] + 1)
+    conteos, _, _ = np.histogram2d(dentro[x], dentro[y], bins=[bordes_x, bordes_y])
+
+    # cuartiles con todas las filas, también las que quedan fuera del histograma
+    grupo = pd.cut(data[x], bordes_x, labels=False, include_lowest=True)
+    cuartiles = data.groupby(grupo)[y].quantile([0.25, 0.5, 0.75]).unstack()
+    cuartiles = cuartiles.reindex(range(len(centros_x)))
+
+    return {
+        "x_centers": centros_x.tolist(),
+        "y_centers": ((bordes_y[1:] + bordes_y[:-1]) / 2).tolist(),
+        # conteos[i, j]: x en el intervalo i, y en el j; se guarda como filas de y
+        "counts": conteos.T.astype(int).tolist(),
+        "p25": sin_nan(cuartiles[0.25].round(2)),
+        "p50": sin_nan(cuartiles[0.5].round(2)),
+        "p75": sin_nan(cuartiles[0.75].round(2)),
+        "outside": int(len(data) - len(dentro)),
+    }
+
+
+def resumen_caja(data, x, y=TARGET):
+    """Cuartiles, bigotes (1.5 IQR) y conteo de y por categoría de x."""
+    resumen = {
+        "categories": [],
+        "q1": [],
+        "median": [],
+        "q3": [],
+        "lowerfence": [],
+        "upperfence": [],
+        "count": [],
+    }
+    for categoria, valores in data.groupby(x)[y]:
+        q1, mediana, q3 = valores.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        resumen["categories"].append(categoria.item() if hasattr(categoria, "item") else categoria)
+        resumen["q1"].append(q1)
+        resumen["median"].append(mediana)
+        resumen["q3"].append(q3)
+        resumen["lowerfence"].append(valores[valores >= q1 - 1.5 * iqr].min())
+        resumen["upperfence"].append(valores[valores <= q3 + 1.5 * iqr].max())
+        resumen["count"].append(len(valores))
+    return {
+        nombre: [float(v) if isinstance(v, (float, np.floating)) else v for v in valores]
+        for nombre, valores in resumen.items()
+    }
+
+
+def calcular_stats(data_file=DATA_FILE, charts=CHARTS, bins=BINS):
+    """Resumen de todos los gráficos a partir del parquet."""
+    data = pd.read_parquet(data_file, columns=[TARGET] + [x for _, x, _ in charts])
+    graficos = []
+    for titulo, x, tipo in charts:
+        resumen = resumen_caja(data, x) if tipo == "box" else resumen_dispersion(data, x, bins=bins)
+        graficos.append({"title": titulo, "x": x, "y": TARGET, "type": tipo, **resumen})
+    return {"key": clave_stats(data_file, charts, bins), "rows": len(data), "charts": graficos}
+
+
+def cargar_stats(data_file=DATA_FILE, stats_file=STATS_FILE):
+    """
+    Estadísticas guardadas en stats_file, recalculadas y guardadas de nuevo
+    si no existen o si su clave no corresponde al parquet actual.
+    """
+    clave = clave_stats(data_file)
+    try:
+        with open(stats_file) as archivo:
+            stats = json.load(archivo)
+        if stats.get("key") == clave:
+            return stats
+    except (OSError, ValueError):
+        pass
+
+    stats = calcular_stats(data_file)
+    # escritura atómica: nadie lee un archivo a medio escribir
+    directorio = os.path.dirname(os.path.abspath(stats_file))
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    with os.fdopen(descriptor, "w") as archivo:
+        json.dump(stats, archivo, separators=(",", ":"), allow_nan=False)
+    # mkstemp crea el archivo solo para su dueño; la API o el tablero pueden
+    # correr con otro usuario
+    os.chmod(temporal, 0o644)
+    os.replace(temporal, stats_file)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data-file", default=DATA_FILE)
+    parser.add_argument("--output", default=STATS_FILE)
+    args = parser.parse_args()
+
+    stats = cargar_stats(args.data_file, args.output)
+    print(f"{len(stats['charts'])} gráficos de {stats['rows']} filas en {args.output} "
+          f"({os.path.getsize(args.output) / 1024:.1f} KiB)")